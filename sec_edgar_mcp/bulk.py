@@ -0,0 +1,391 @@
+"""Local index built from EDGAR's quarterly form index for cross-filer queries."""
+
+import gzip
+import io
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import zipfile
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from .config import get_cache_dir, use_local_data
+from .http_cache import FileCache
+from .http_client import cached_get, get_session
+from .name_matching import name_key
+
+logger = logging.getLogger(__name__)
+
+FORM_INDEX_URL = "https://www.sec.gov/Archives/edgar/full-index/{year}/QTR{quarter}/form.gz"
+COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
+SUBMISSIONS_ARCHIVE_URL = "https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip"
+
+# Only these forms are materialized; everything else in form.idx is skipped.
+# Form 4s are listed once per issuer and once per reporting owner, which makes
+# them a name -> CIK directory for insiders.
+INDEXED_FORM_TYPES = frozenset({
+    '13F-HR', '13F-HR/A', 'SC 13D', 'SC 13D/A', 'SC 13G', 'SC 13G/A', '4', '4/A'
+})
+
+# Bumped whenever the table layout changes; older databases are rebuilt
+_SCHEMA_VERSION = 3
+
+# Serializes refreshes so concurrent tools don't download the index twice
+_refresh_lock = threading.Lock()
+
+# SEC regenerates the ticker map daily
+_company_tickers_cache = FileCache('company_tickers', ttl=timedelta(days=1))
+
+# Company submission histories change a few times a day at most
+_submissions_cache = FileCache('submissions', ttl=timedelta(hours=6))
+
+# The nightly submissions.zip, opened once; its central directory lists ~1M members
+_archive: Optional[zipfile.ZipFile] = None
+_archive_mtime: Optional[float] = None
+_archive_lock = threading.Lock()
+# Serializes downloads of the archive; readers only wait on _archive_lock for the swap
+_archive_download_lock = threading.Lock()
+
+
+def _index_path() -> Path:
+    return get_cache_dir('bulk') / 'index.sqlite3'
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(_index_path())
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+        conn.executescript(f"""
+            DROP TABLE IF EXISTS filings;
+            DROP TABLE IF EXISTS meta;
+            PRAGMA user_version = {_SCHEMA_VERSION};
+        """)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS filings (
+            form_type TEXT NOT NULL,
+            company_name TEXT NOT NULL,
+            cik TEXT NOT NULL,
+            date_filed TEXT NOT NULL,
+            file_name TEXT NOT NULL,
+            name_key TEXT NOT NULL,
+            accession TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS filings_form_type ON filings (form_type, date_filed);
+        CREATE INDEX IF NOT EXISTS filings_name_key ON filings (name_key);
+        CREATE INDEX IF NOT EXISTS filings_accession ON filings (accession);
+        CREATE TABLE IF NOT EXISTS tickers (
+            ticker TEXT PRIMARY KEY,
+            cik TEXT NOT NULL,
+            title TEXT
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """)
+    return conn
+
+
+def _current_quarter(today: Optional[date] = None) -> Tuple[int, int]:
+    today = today or date.today()
+    return today.year, (today.month - 1) // 3 + 1
+
+
+def _parse_form_index(lines: Iterable[str]) -> Iterator[Tuple[str, str, str, str, str, str, str]]:
+    """Yield (form_type, company_name, cik, date_filed, file_name, name_key, accession) rows of interest.
+
+    form.idx is fixed-width; column offsets are taken from its header line.
+    Each party to a filing is listed under its own edgar/data/<cik>/<accession>.txt
+    path, so the accession is what ties a filing's rows together.
+    """
+    lines = iter(lines)
+    offsets = None
+    # Skip the preamble up to and including the dashed separator line
+    for line in lines:
+        if line.startswith('Form Type'):
+            offsets = [line.index(column) for column in ('Company Name', 'CIK', 'Date Filed', 'File Name')]
+        elif line.startswith('---'):
+            break
+    if offsets is None:
+        return
+    name_at, cik_at, date_at, file_at = offsets
+
+    for line in lines:
+        form_type = line[:name_at].rstrip()
+        if form_type not in INDEXED_FORM_TYPES:
+            continue
+        company_name = line[name_at:cik_at].strip()
+        file_name = line[file_at:].strip()
+        yield (
+            form_type,
+            company_name,
+            line[cik_at:date_at].strip().zfill(10),
+            line[date_at:file_at].strip(),
+            file_name,
+            name_key(company_name),
+            file_name.rsplit('/', 1)[-1].removesuffix('.txt')
+        )
+
+
+def _refresh(conn: sqlite3.Connection, user_agent: str):
+    headers = {'User-Agent': user_agent}
+    year, quarter = _current_quarter()
+
+    tickers = [
+        (entry['ticker'].upper(), str(entry['cik_str']).zfill(10), entry.get('title'))
+        for entry in json.loads(load_company_tickers(user_agent)).values()
+    ]
+
+    # Decompress the index straight off the socket so memory stays flat
+    url = FORM_INDEX_URL.format(year=year, quarter=quarter)
+    with get_session().get(url, headers=headers, timeout=120, stream=True) as response, conn:
+        response.raise_for_status()
+        response.raw.decode_content = False
+        lines = io.TextIOWrapper(gzip.GzipFile(fileobj=response.raw), encoding='latin-1')
+
+        conn.execute("DELETE FROM filings")
+        cursor = conn.executemany("INSERT INTO filings VALUES (?, ?, ?, ?, ?, ?, ?)", _parse_form_index(lines))
+        filing_count = cursor.rowcount
+        conn.execute("DELETE FROM tickers")
+        conn.executemany("INSERT OR REPLACE INTO tickers VALUES (?, ?, ?)", tickers)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)",
+            (datetime.now().isoformat(),)
+        )
+    logger.info(f"Bulk index refreshed for {year} QTR{quarter}: {filing_count} filings, {len(tickers)} tickers")
+
+
+def _is_fresh(conn: sqlite3.Connection, max_age_days: float) -> bool:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+    if not row:
+        return False
+    return datetime.now() - datetime.fromisoformat(row[0]) < timedelta(days=max_age_days)
+
+
+def ensure_bulk_index(user_agent: str, max_age_days: float = 1) -> Path:
+    """Download the current quarter's form index unless the local copy is fresh.
+
+    Returns the path of the SQLite database holding the index.
+    """
+    with _refresh_lock, closing(_connect()) as conn:
+        if not _is_fresh(conn, max_age_days):
+            _refresh(conn, user_agent)
+    return _index_path()
+
+
+def query_filings(
+    form_types: Iterable[str],
+    since: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Return indexed filings of the given form types, newest first."""
+    form_types = list(form_types)
+    sql = f"SELECT * FROM filings WHERE form_type IN ({', '.join('?' * len(form_types))})"
+    params: List[Any] = form_types
+    if since:
+        sql += " AND date_filed >= ?"
+        params.append(since)
+    sql += " ORDER BY date_filed DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    with closing(_connect()) as conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(row) for row in conn.execute(sql, params)]
+
+
+def find_filers_by_name(
+    name: str,
+    form_types: Iterable[str] = ('4', '4/A')
+) -> List[Dict[str, Any]]:
+    """Return filers whose name matches ``name`` regardless of word order.
+
+    Each result has the filer's cik, the name as filed, its filing count and
+    the tickers of the other parties (issuers) on those filings.
+    """
+    form_types = list(form_types)
+    placeholders = ', '.join('?' * len(form_types))
+    sql = f"""
+        SELECT p.cik, p.company_name, COUNT(DISTINCT p.accession), GROUP_CONCAT(DISTINCT t.ticker)
+        FROM filings p
+        LEFT JOIN filings i ON i.accession = p.accession AND i.cik != p.cik
+        LEFT JOIN tickers t ON t.cik = i.cik
+        WHERE p.name_key = ? AND p.form_type IN ({placeholders})
+        GROUP BY p.cik, p.company_name
+        ORDER BY COUNT(DISTINCT p.accession) DESC
+    """
+    with closing(_connect()) as conn:
+        rows = conn.execute(sql, [name_key(name), *form_types]).fetchall()
+    return [
+        {
+            'cik': cik,
+            'name': filer_name,
+            'filing_count': count,
+            'tickers': tickers.split(',') if tickers else []
+        }
+        for cik, filer_name, count, tickers in rows
+    ]
+
+
+def indexed_since() -> Optional[date]:
+    """First filing date the local index covers: the start of the quarter it was last refreshed in."""
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+    if not row:
+        return None
+    year, quarter = _current_quarter(datetime.fromisoformat(row[0]).date())
+    return date(year, 3 * quarter - 2, 1)
+
+
+def find_filings_by_person(
+    name: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    form_types: Iterable[str] = ('4', '4/A'),
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Return the filings a person reported on, newest first, with the issuer of each.
+
+    A Form 4 is listed once per reporting owner and once per issuer, each under
+    its own path; the person's row is found through the name_key index and
+    joined to the other parties by accession. Joint filings list co-reporting
+    owners too, so the issuer is taken to be the party with a ticker, falling
+    back to any other party only when none has one.
+    """
+    form_types = list(form_types)
+    sql = f"""
+        SELECT p.file_name, p.form_type, p.date_filed, p.company_name, i.cik, i.company_name, t.ticker
+        FROM filings p
+        JOIN filings i ON i.rowid = (
+            SELECT o.rowid
+            FROM filings o
+            LEFT JOIN tickers ot ON ot.cik = o.cik
+            WHERE o.accession = p.accession AND o.cik != p.cik
+            ORDER BY ot.ticker IS NULL, o.rowid
+            LIMIT 1
+        )
+        LEFT JOIN tickers t ON t.cik = i.cik
+        WHERE p.name_key = ? AND p.form_type IN ({', '.join('?' * len(form_types))})
+    """
+    params: List[Any] = [name_key(name), *form_types]
+    if since:
+        sql += " AND p.date_filed >= ?"
+        params.append(since)
+    if until:
+        sql += " AND p.date_filed <= ?"
+        params.append(until)
+    # One row per filing, even when the issuer has several tickers
+    sql += " GROUP BY p.accession ORDER BY p.date_filed DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    with closing(_connect()) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [
+        {
+            'file_name': file_name,
+            'form_type': form_type,
+            'date_filed': date_filed,
+            'reporting_owner': owner,
+            'issuer_cik': issuer_cik,
+            'issuer_name': issuer_name,
+            'ticker': ticker
+        }
+        for file_name, form_type, date_filed, owner, issuer_cik, issuer_name, ticker in rows
+    ]
+
+
+def lookup_ticker(ticker: str) -> Optional[str]:
+    """Return the 10-digit CIK for a ticker from the local index, if present."""
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT cik FROM tickers WHERE ticker = ?", (ticker.upper(),)).fetchone()
+    return row[0] if row else None
+
+
+def load_company_tickers(user_agent: str, session: Optional[requests.Session] = None) -> bytes:
+    """Return SEC's company_tickers.json, shared by every caller and downloaded at most once a day."""
+    return cached_get(_company_tickers_cache, COMPANY_TICKERS_URL, {'User-Agent': user_agent}, session=session)
+
+
+def _submissions_archive_path() -> Path:
+    return get_cache_dir('bulk') / 'submissions.zip'
+
+
+def ensure_submissions_archive(user_agent: str, max_age_days: float = 1) -> Path:
+    """Download SEC's nightly submissions.zip unless the local copy is fresh.
+
+    The archive is several gigabytes, so it is streamed to disk and swapped in
+    atomically once complete.
+    """
+    path = _submissions_archive_path()
+    with _archive_download_lock:
+        try:
+            age = datetime.now().timestamp() - path.stat().st_mtime
+            if age < max_age_days * 86400:
+                return path
+        except FileNotFoundError:
+            pass
+        
+        logger.info("Downloading the EDGAR submissions archive")
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f, get_session().get(
+                SUBMISSIONS_ARCHIVE_URL, headers={'User-Agent': user_agent}, timeout=120, stream=True
+            ) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+            with _archive_lock:
+                os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    return path
+
+
+def _read_archived_submissions(cik: str) -> Optional[bytes]:
+    """Return CIK##########.json from the local submissions archive, if it has one."""
+    global _archive, _archive_mtime
+    path = _submissions_archive_path()
+    with _archive_lock:
+        mtime = path.stat().st_mtime
+        if _archive is None or _archive_mtime != mtime:
+            if _archive is not None:
+                _archive.close()
+            _archive = zipfile.ZipFile(path)
+            _archive_mtime = mtime
+        archive = _archive
+    try:
+        # ZipFile serializes reads on its shared file handle, so threads can share it
+        return archive.read(f"CIK{cik}.json")
+    except KeyError:
+        return None
+
+
+def load_submissions(cik: str, user_agent: str, session: Optional[requests.Session] = None) -> bytes:
+    """Return a company's submissions JSON.
+
+    With SEC_EDGAR_USE_LOCAL_DATA set this reads the nightly bulk archive,
+    downloading it on first use; otherwise, or when the archive has no entry
+    for the CIK, it comes from data.sec.gov through the revalidating cache.
+    """
+    cik = cik.zfill(10)
+    if use_local_data():
+        try:
+            ensure_submissions_archive(user_agent)
+            data = _read_archived_submissions(cik)
+            if data is not None:
+                return data
+        except (OSError, requests.RequestException, zipfile.BadZipFile) as e:
+            logger.warning(f"Local submissions archive unavailable, using the API: {e}")
+    
+    return cached_get(_submissions_cache, SUBMISSIONS_URL.format(cik=cik), {'User-Agent': user_agent}, session=session)
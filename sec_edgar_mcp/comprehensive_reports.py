@@ -1,6 +1,8 @@
 """Comprehensive entity reports combining all SEC data sources."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import List, Dict, Any, Optional
 from datetime import date, datetime, timedelta
 from mcp.server.fastmcp import FastMCP
@@ -10,11 +12,14 @@ from .proxy_parser import get_current_board_from_proxy
 from .insider_tools import get_insider_transactions, get_recent_insider_activity
 from .institutional_tools import search_institutional_ownership
 from .models import ComprehensiveInsiderProfile, PersonCompanyMapping, BoardPosition
-from .name_matching import name_matcher
+from .name_matching import NAME_MATCH_THRESHOLD, name_matcher
 from .utils import rate_limited, cached
 
 logger = logging.getLogger(__name__)
 
+# Per-company lookups in steps 2 and 3; every request still goes through the shared rate limiter
+_COMPANY_WORKERS = 4
+
 
 def register_comprehensive_report_tools(mcp: FastMCP, user_agent: str):
     """Register comprehensive report tools with the MCP server."""
@@ -132,57 +137,22 @@ def generate_comprehensive_insider_report(
         report_data["companies"] = cross_company_result.get("companies", [])
         report_data["data_sources"].append("Form 4 (Insider Transactions)")
         
-        # 2. Current board positions from proxy statements
-        logger.info("Step 2: Current board positions from proxy statements")
-        current_board_positions = []
-        
-        for company in report_data["companies"]:
-            if company.get("position_status") == "current":
-                try:
-                    proxy_positions = get_current_board_from_proxy(
-                        company=company["ticker"],
-                        user_agent=user_agent
-                    )
-                    
-                    # Filter positions for this person
-                    person_positions = [
-                        pos for pos in proxy_positions
-                        if name_matcher.is_name_match(person_name, pos.person_name)
-                    ]
-                    
-                    current_board_positions.extend([pos.to_dict() for pos in person_positions])
-                    
-                except Exception as e:
-                    logger.debug(f"Could not get proxy data for {company['ticker']}: {e}")
+        # 2 and 3 both only need the company list, so fetch them side by side
+        logger.info("Steps 2-3: Current board positions and detailed transaction analysis")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            board_future = executor.submit(
+                _current_board_positions, person_name, report_data["companies"], user_agent
+            )
+            transactions_future = executor.submit(
+                _detailed_transactions, person_name, report_data["companies"], years_back, user_agent
+            )
+            current_board_positions = board_future.result()
+            detailed_transactions = transactions_future.result()
         
         report_data["current_board_positions"] = current_board_positions
         if current_board_positions:
             report_data["data_sources"].append("DEF 14A (Proxy Statements)")
         
-        # 3. Detailed transaction analysis per company
-        logger.info("Step 3: Detailed transaction analysis")
-        detailed_transactions = {}
-        
-        for company in report_data["companies"]:
-            try:
-                detailed_result = get_insider_transactions(
-                    person_name=person_name,
-                    company=company["ticker"],
-                    start_date=(date.today() - timedelta(days=years_back * 365)).isoformat(),
-                    end_date=date.today().isoformat(),
-                    user_agent=user_agent
-                )
-                
-                if detailed_result.get("transaction_count", 0) > 0:
-                    detailed_transactions[company["ticker"]] = {
-                        "company_name": company["company_name"],
-                        "transaction_details": detailed_result["transactions"],
-                        "summary": detailed_result["summary"]
-                    }
-                    
-            except Exception as e:
-                logger.debug(f"Error getting detailed transactions for {company['ticker']}: {e}")
-        
         report_data["detailed_transactions"] = detailed_transactions
         
         # 4. Board position timeline analysis
@@ -224,6 +194,72 @@ def generate_comprehensive_insider_report(
         }
 
 
+def _current_board_positions(person_name: str, companies: List[Dict], user_agent: str) -> List[Dict]:
+    """Step 2: the person's positions in the latest proxy of each current company."""
+    def company_positions(company: Dict) -> List[Dict]:
+        try:
+            proxy_positions = get_current_board_from_proxy(
+                company=company["ticker"],
+                user_agent=user_agent
+            )
+            
+            # Filter positions for this person
+            scores = name_matcher.similarities(person_name, [pos.person_name for pos in proxy_positions])
+            return [
+                pos.to_dict() for pos, score in zip(proxy_positions, scores)
+                if score >= NAME_MATCH_THRESHOLD
+            ]
+            
+        except Exception as e:
+            logger.debug(f"Could not get proxy data for {company['ticker']}: {e}")
+            return []
+    
+    current_companies = [c for c in companies if c.get("position_status") == "current"]
+    
+    # Each proxy is an independent download; map() keeps the results in company order
+    with ThreadPoolExecutor(max_workers=_COMPANY_WORKERS) as executor:
+        return list(chain.from_iterable(executor.map(company_positions, current_companies)))
+
+
+def _detailed_transactions(
+    person_name: str,
+    companies: List[Dict],
+    years_back: int,
+    user_agent: str
+) -> Dict[str, Any]:
+    """Step 3: the person's Form 4 transactions at each company, keyed by ticker."""
+    # Same window for every company; compute it once rather than per company
+    today = date.today()
+    window_start = (today - timedelta(days=years_back * 365)).isoformat()
+    window_end = today.isoformat()
+    
+    def company_transactions(company: Dict) -> Optional[Dict[str, Any]]:
+        try:
+            return get_insider_transactions(
+                person_name=person_name,
+                company=company["ticker"],
+                start_date=window_start,
+                end_date=window_end,
+                user_agent=user_agent
+            )
+        except Exception as e:
+            logger.debug(f"Error getting detailed transactions for {company['ticker']}: {e}")
+            return None
+    
+    detailed_transactions = {}
+    
+    with ThreadPoolExecutor(max_workers=_COMPANY_WORKERS) as executor:
+        for company, detailed_result in zip(companies, executor.map(company_transactions, companies)):
+            if detailed_result and detailed_result.get("transaction_count", 0) > 0:
+                detailed_transactions[company["ticker"]] = {
+                    "company_name": company["company_name"],
+                    "transaction_details": detailed_result["transactions"],
+                    "summary": detailed_result["summary"]
+                }
+    
+    return detailed_transactions
+
+
 def analyze_board_position_timeline(person_name: str, user_agent: str = None) -> Dict[str, Any]:
     """Analyze timeline of board positions with appointment/resignation tracking."""
     
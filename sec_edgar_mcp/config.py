@@ -1,4 +1,6 @@
 import os
+from pathlib import Path
+
 from dotenv import load_dotenv
 
 
@@ -11,3 +13,35 @@ def initialize_config():
         raise ValueError("SEC_EDGAR_USER_AGENT environment variable is not set.")
 
     return sec_edgar_user_agent
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """Return (and create) a directory under the local cache root.
+
+    The root defaults to ``~/.cache/sec_edgar_mcp`` and can be overridden with
+    the SEC_EDGAR_CACHE_DIR environment variable.
+    """
+    root = os.getenv("SEC_EDGAR_CACHE_DIR") or Path.home() / ".cache" / "sec_edgar_mcp"
+    path = Path(root).joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes")
+
+
+def use_local_data() -> bool:
+    """Whether to read SEC's bulk archives from disk instead of per-company API calls.
+
+    Enabled by setting SEC_EDGAR_USE_LOCAL_DATA to 1, true or yes.
+    """
+    return _env_flag("SEC_EDGAR_USE_LOCAL_DATA")
+
+
+def persist_cache() -> bool:
+    """Whether ``@cached`` results are also written to disk to outlive the process.
+
+    Enabled by setting SEC_EDGAR_PERSIST_CACHE to 1, true or yes.
+    """
+    return _env_flag("SEC_EDGAR_PERSIST_CACHE")
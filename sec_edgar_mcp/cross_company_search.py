@@ -1,13 +1,14 @@
 """Cross-company insider search capabilities for SEC EDGAR MCP."""
 
+import json
 import logging
-import requests
 from typing import List, Dict, Any, Optional, Set
 from datetime import date, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from mcp.server.fastmcp import FastMCP
 
+from .bulk import load_company_tickers
 from .insider_tools import get_insider_transactions
 from .models import InsiderTransaction
 from .utils import rate_limited, cached, normalize_ticker, parse_date
@@ -152,13 +153,13 @@ def get_all_insider_companies(
             
             logger.info(f"Full-text search found {len(companies_from_search)} companies for {person_name}")
             
-            # Convert to our format and get detailed transaction data
-            companies_with_activity = []
-            
-            for company_info in companies_from_search:
+            # Each company is an independent lookup; run them side by side and
+            # let the shared rate limiter keep the pool under SEC's cap
+            def summarize_company(company_info):
+                """Build the insider summary for one company found by full-text search."""
                 ticker = company_info.get('ticker')
                 if not ticker:
-                    continue
+                    return None
                 
                 try:
                     # Get detailed transactions for this company
@@ -178,7 +179,7 @@ def get_all_insider_companies(
                         position_status = determine_position_status(transactions, end_date)
                         current_position = extract_current_position(transactions)
                         
-                        companies_with_activity.append(CompanyInsiderSummary(
+                        return CompanyInsiderSummary(
                             ticker=ticker,
                             company_name=company_info.get('company_name', ''),
                             cik=company_info.get('cik'),
@@ -190,13 +191,13 @@ def get_all_insider_companies(
                             last_transaction_date=parse_date(summary.get('date_range', {}).get('last')) if summary.get('date_range') else None,
                             current_position=current_position,
                             position_status=position_status
-                        ))
-                        
+                        )
+                
                 except Exception as e:
                     logger.warning(f"Error getting detailed transactions for {ticker}: {e}")
                     # Still include basic info if we have it
                     if company_info.get('filing_count', 0) >= min_transactions:
-                        companies_with_activity.append(CompanyInsiderSummary(
+                        return CompanyInsiderSummary(
                             ticker=ticker,
                             company_name=company_info.get('company_name', ''),
                             cik=company_info.get('cik'),
@@ -208,8 +209,15 @@ def get_all_insider_companies(
                             last_transaction_date=parse_date(company_info.get('last_filing')),
                             current_position='Unknown',
                             position_status='unknown'
-                        ))
-                    continue
+                        )
+                
+                return None
+            
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                companies_with_activity = [
+                    summary for summary in executor.map(summarize_company, companies_from_search)
+                    if summary
+                ]
             
         except Exception as e:
             logger.error(f"Full-text search failed: {str(e)}")
@@ -424,14 +432,8 @@ def get_all_public_companies(user_agent: str) -> List[Dict[str, Any]]:
     Uses the SEC's company tickers endpoint to get comprehensive list.
     """
     try:
-        url = "https://www.sec.gov/files/company_tickers.json"
-        headers = {'User-Agent': user_agent}
-        
         logger.info("Fetching complete list of public companies from SEC")
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = json.loads(load_company_tickers(user_agent))
         
         # Convert to list format
         companies = []
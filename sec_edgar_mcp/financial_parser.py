@@ -8,6 +8,7 @@ from secedgar import filings, FilingType
 from mcp.server.fastmcp import FastMCP
 from bs4 import BeautifulSoup
 
+from .http_client import get_secedgar_client
 from .models import RevenueSegment, GeographicRevenue, ProductRevenueTrend
 from .utils import (
     cached, rate_limited, parse_date, clean_number,
@@ -164,7 +165,7 @@ def get_product_revenue(
         annual_filings = filings(
             cik_lookup=company,
             filing_type=FilingType.FILING_10K,
-            user_agent=user_agent,
+            client=get_secedgar_client(user_agent),
             start_date=start_date,
             end_date=end_date
         )
@@ -173,7 +174,7 @@ def get_product_revenue(
         quarterly_filings = filings(
             cik_lookup=company,
             filing_type=FilingType.FILING_10Q,
-            user_agent=user_agent,
+            client=get_secedgar_client(user_agent),
             start_date=start_date,
             end_date=end_date,
             count=12  # Last 12 quarters
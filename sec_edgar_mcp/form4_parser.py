@@ -1,12 +1,14 @@
 """Parser for SEC Form 4 XML documents."""
 
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from xml.etree import ElementTree as ET
-from bs4 import BeautifulSoup
+import re
+from typing import List, Optional, Dict, Any, Union
+from datetime import datetime, timedelta
+from lxml import etree
 import requests
 
+from .http_cache import FileCache
+from .http_client import get_session
 from .models import InsiderTransaction, TransactionType, OwnershipType
 from .utils import (
     parse_date, parse_datetime, clean_number, 
@@ -15,6 +17,35 @@ from .utils import (
 
 logger = logging.getLogger(__name__)
 
+# Namespace declarations, default and prefixed alike, stripped before parsing
+_XMLNS_RE = re.compile(r'xmlns[^=]*="[^"]*"')
+_XMLNS_BYTES_RE = re.compile(rb'xmlns[^=]*="[^"]*"')
+
+# lxml's C parser. Text is handed over as UTF-8 bytes, so its declared encoding is
+# overridden; raw downloads keep theirs and libxml2 decodes them itself.
+_XML_PARSER = etree.XMLParser(encoding='utf-8', resolve_entities=False, no_network=True)
+_XML_BYTES_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+# Second pass for malformed documents: libxml2 skips what it can't parse and keeps the rest
+_RECOVER_PARSER = etree.XMLParser(
+    encoding='utf-8', resolve_entities=False, no_network=True, recover=True, huge_tree=True
+)
+_RECOVER_BYTES_PARSER = etree.XMLParser(resolve_entities=False, no_network=True, recover=True, huge_tree=True)
+
+# Table lookups compiled once per process; './/' also matches direct children
+_NON_DERIVATIVE_TABLE = etree.XPath('.//nonDerivativeTable')
+_NON_DERIVATIVE_TRANSACTIONS = etree.XPath('.//nonDerivativeTransaction')
+_NON_DERIVATIVE_HOLDINGS = etree.XPath('.//nonDerivativeHolding')
+_DERIVATIVE_TABLE = etree.XPath('.//derivativeTable')
+_DERIVATIVE_TRANSACTIONS = etree.XPath('.//derivativeTransaction')
+
+# search_filing reads this much at a time, carrying the tail over so matches can span chunks
+_SCAN_CHUNK_SIZE = 64 * 1024
+_SCAN_OVERLAP = 1024
+
+# Index pages and Form 4 XML fetched by the parser, stored undecoded and kept for a day
+_document_cache = FileCache('form4_raw_documents', ttl=timedelta(hours=24))
+
 
 class Form4Parser:
     """Parser for Form 4 insider trading filings."""
@@ -38,71 +69,124 @@ class Form4Parser:
         'Z': TransactionType.OTHER
     }
     
-    def __init__(self, user_agent: str):
+    def __init__(self, user_agent: str, session: Optional[requests.Session] = None):
         self.user_agent = user_agent
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
+        # Parsers are built per tool call; the shared session keeps connections alive across them
+        self.session = session or get_session()
+        self.headers = {'User-Agent': user_agent}
     
-    @rate_limited
     def fetch_filing_content(self, url: str) -> Optional[str]:
-        """Fetch filing content from URL."""
+        """Fetch filing content from URL as text, using the on-disk copy when there is one."""
+        content = self.fetch_filing_bytes(url)
+        return content.decode('utf-8', errors='replace') if content is not None else None
+    
+    def fetch_filing_bytes(self, url: str) -> Optional[bytes]:
+        """Fetch a filing undecoded; parse_form4_xml takes the bytes as they are."""
+        cached_content = _document_cache.get(url)
+        if cached_content is not None:
+            return cached_content
+        
+        content = self._download(url)
+        if content is not None:
+            _document_cache.set(url, content)
+        return content
+    
+    @rate_limited
+    def _download(self, url: str) -> Optional[bytes]:
+        """Download a filing document."""
         try:
-            response = self.session.get(url, timeout=30)
+            response = self.session.get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
-            return response.text
+            return response.content
         except Exception as e:
             logger.error(f"Error fetching filing from {url}: {e}")
             return None
     
-    def parse_form4_xml(self, xml_content: str, accession_number: str) -> List[InsiderTransaction]:
-        """Parse Form 4 XML content and extract transactions."""
-        transactions = []
+    @rate_limited
+    def search_filing(self, url: str, pattern: re.Pattern) -> Optional[re.Match]:
+        """
+        Stream a document until a bytes pattern matches, without decoding it.
         
+        The connection is closed on the first match, so the rest of a large
+        submission file is never transferred.
+        """
         try:
-            # Parse XML - handle potential namespace issues
-            # Remove namespace declarations for easier parsing
+            with self.session.get(url, headers=self.headers, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                buffer = b''
+                for chunk in response.iter_content(chunk_size=_SCAN_CHUNK_SIZE):
+                    buffer += chunk
+                    match = pattern.search(buffer)
+                    # A match running into the end of the buffer may continue in the next chunk
+                    if match and match.end() < len(buffer):
+                        return match
+                    buffer = buffer[-_SCAN_OVERLAP:]
+                return pattern.search(buffer)
+        except Exception as e:
+            logger.error(f"Error fetching filing from {url}: {e}")
+            return None
+    
+    def parse_form4_xml(self, xml_content: Union[str, bytes], accession_number: str) -> List[InsiderTransaction]:
+        """Parse Form 4 XML content, as text or as downloaded bytes, and extract transactions."""
+        transactions = []
+        
+        # Parse XML - handle potential namespace issues
+        # Remove namespace declarations for easier parsing
+        if isinstance(xml_content, bytes):
+            # Bytes skip the decode/encode round trip and keep their declared encoding
+            xml_bytes = _XMLNS_BYTES_RE.sub(b'', xml_content) if b'xmlns' in xml_content else xml_content
+            parser, recover_parser = _XML_BYTES_PARSER, _RECOVER_BYTES_PARSER
+        else:
             xml_content_clean = xml_content
             if 'xmlns' in xml_content:
                 # Strip default namespace to make parsing easier
-                import re
-                xml_content_clean = re.sub(r'xmlns[^=]*="[^"]*"', '', xml_content)
-                xml_content_clean = re.sub(r'xmlns:[^=]*="[^"]*"', '', xml_content_clean)
-            
-            root = ET.fromstring(xml_content_clean)
-            
-            # Log root element for debugging
-            logger.info(f"Parsing Form 4 XML - root element: {root.tag}")
-            logger.debug(f"Root children: {[child.tag for child in root][:10]}")
-            
-            # Extract basic filing information
-            filing_info = self._extract_filing_info(root)
-            if not filing_info:
-                logger.warning(f"Could not extract filing info from {accession_number}")
-                # Log what we tried to find
-                logger.debug(f"Looking for issuer: {root.find('.//issuer') is not None}")
-                logger.debug(f"Looking for reportingOwner: {root.find('.//reportingOwner') is not None}")
+                xml_content_clean = _XMLNS_RE.sub('', xml_content)
+            xml_bytes = xml_content_clean.encode('utf-8')
+            parser, recover_parser = _XML_PARSER, _RECOVER_PARSER
+        
+        try:
+            root = etree.fromstring(xml_bytes, parser)
+        except etree.XMLSyntaxError as e:
+            # Retry malformed XML with the recovering parser
+            logger.warning(f"Malformed XML in {accession_number}, parsing in recovery mode: {e}")
+            try:
+                root = etree.fromstring(xml_bytes, recover_parser)
+            except etree.XMLSyntaxError as e:
+                logger.error(f"Recovering parser failed for {accession_number}: {e}")
                 return transactions
-            
-            # Extract non-derivative transactions
-            non_derivative_transactions = self._extract_non_derivative_transactions(
-                root, filing_info, accession_number
-            )
-            transactions.extend(non_derivative_transactions)
-            
-            # Extract derivative transactions (options, warrants, etc.)
-            derivative_transactions = self._extract_derivative_transactions(
-                root, filing_info, accession_number
-            )
-            transactions.extend(derivative_transactions)
-            
-        except ET.ParseError as e:
-            logger.error(f"Error parsing XML for {accession_number}: {e}")
-            # Try alternative parsing with BeautifulSoup for malformed XML
-            transactions = self._parse_with_beautifulsoup(xml_content, accession_number)
+            if root is None:
+                return transactions
+        
+        # Log root element for debugging
+        logger.debug("Parsing Form 4 XML - root element: %s", root.tag)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Root children: %s", [child.tag for child in root][:10])
+        
+        # Extract basic filing information
+        filing_info = self._extract_filing_info(root)
+        if not filing_info:
+            logger.warning(f"Could not extract filing info from {accession_number}")
+            # Log what we tried to find; each check walks the whole tree, so only when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Looking for issuer: %s", root.find('.//issuer') is not None)
+                logger.debug("Looking for reportingOwner: %s", root.find('.//reportingOwner') is not None)
+            return transactions
+        
+        # Extract non-derivative transactions
+        non_derivative_transactions = self._extract_non_derivative_transactions(
+            root, filing_info, accession_number
+        )
+        transactions.extend(non_derivative_transactions)
+        
+        # Extract derivative transactions (options, warrants, etc.)
+        derivative_transactions = self._extract_derivative_transactions(
+            root, filing_info, accession_number
+        )
+        transactions.extend(derivative_transactions)
         
         return transactions
     
-    def _extract_filing_info(self, root: ET.Element) -> Optional[Dict[str, Any]]:
+    def _extract_filing_info(self, root: etree._Element) -> Optional[Dict[str, Any]]:
         """Extract basic filing information from XML root."""
         info = {}
         
@@ -134,7 +218,7 @@ class Form4Parser:
                 )
                 info['insider_cik'] = self._get_text(owner_id, 'rptOwnerCik')
                 
-                logger.debug(f"Extracted insider name: {info.get('insider_name')}")
+                logger.debug("Extracted insider name: %s", info.get('insider_name'))
             
             # Extract relationships
             relationships = owner.find('.//reportingOwnerRelationship')
@@ -165,7 +249,7 @@ class Form4Parser:
     
     def _extract_non_derivative_transactions(
         self, 
-        root: ET.Element, 
+        root: etree._Element, 
         filing_info: Dict[str, Any],
         accession_number: str
     ) -> List[InsiderTransaction]:
@@ -173,22 +257,18 @@ class Form4Parser:
         transactions = []
         
         # Find non-derivative table - it might be a direct child or nested
-        non_deriv_table = root.find('.//nonDerivativeTable')
-        if non_deriv_table is None:
-            non_deriv_table = root.find('nonDerivativeTable')
+        non_deriv_table = next(iter(_NON_DERIVATIVE_TABLE(root)), None)
         
         if non_deriv_table is None:
-            logger.debug(f"No nonDerivativeTable found in {accession_number}")
+            logger.debug("No nonDerivativeTable found in %s", accession_number)
             return transactions
         
-        logger.info(f"Found nonDerivativeTable with {len(non_deriv_table)} children")
+        logger.debug("Found nonDerivativeTable with %d children", len(non_deriv_table))
         
-        # Process each transaction - try both nested and direct children
-        trans_elements = non_deriv_table.findall('.//nonDerivativeTransaction')
-        if not trans_elements:
-            trans_elements = non_deriv_table.findall('nonDerivativeTransaction')
+        # Process each transaction - nested and direct children alike
+        trans_elements = _NON_DERIVATIVE_TRANSACTIONS(non_deriv_table)
         
-        logger.info(f"Found {len(trans_elements)} nonDerivativeTransaction elements")
+        logger.debug("Found %d nonDerivativeTransaction elements", len(trans_elements))
         
         for trans_elem in trans_elements:
             try:
@@ -202,7 +282,7 @@ class Form4Parser:
         
         # Process holdings if no transactions
         if not transactions:
-            for holding_elem in non_deriv_table.findall('.//nonDerivativeHolding'):
+            for holding_elem in _NON_DERIVATIVE_HOLDINGS(non_deriv_table):
                 try:
                     holding = self._parse_non_derivative_holding(
                         holding_elem, filing_info, accession_number
@@ -216,7 +296,7 @@ class Form4Parser:
     
     def _parse_non_derivative_transaction(
         self,
-        trans_elem: ET.Element,
+        trans_elem: etree._Element,
         filing_info: Dict[str, Any],
         accession_number: str
     ) -> Optional[InsiderTransaction]:
@@ -246,14 +326,14 @@ class Form4Parser:
             
             # Extract transaction code
             trans_coding = trans_elem.find('.//transactionCoding')
-            trans_code = self._get_text(trans_coding, './/transactionCode') if trans_coding else 'P'
+            trans_code = self._get_text(trans_coding, './/transactionCode') if trans_coding is not None and len(trans_coding) else 'P'
             trans_type = self.TRANSACTION_CODE_MAP.get(trans_code, TransactionType.OTHER)
             
             # Extract ownership information
             post_trans = trans_elem.find('.//postTransactionAmounts')
             shares_after = clean_number(
                 self._get_text(post_trans, './/sharesOwnedFollowingTransaction/value')
-            ) if post_trans else 0
+            ) if post_trans is not None and len(post_trans) else 0
             
             ownership = trans_elem.find('.//ownershipNature')
             ownership_type = OwnershipType.DIRECT
@@ -290,7 +370,7 @@ class Form4Parser:
     
     def _parse_non_derivative_holding(
         self,
-        holding_elem: ET.Element,
+        holding_elem: etree._Element,
         filing_info: Dict[str, Any],
         accession_number: str
     ) -> Optional[InsiderTransaction]:
@@ -346,7 +426,7 @@ class Form4Parser:
     
     def _extract_derivative_transactions(
         self,
-        root: ET.Element,
+        root: etree._Element,
         filing_info: Dict[str, Any],
         accession_number: str
     ) -> List[InsiderTransaction]:
@@ -354,12 +434,12 @@ class Form4Parser:
         transactions = []
         
         # Find derivative table
-        deriv_table = root.find('.//derivativeTable')
+        deriv_table = next(iter(_DERIVATIVE_TABLE(root)), None)
         if deriv_table is None:
             return transactions
         
         # Process each transaction
-        for trans_elem in deriv_table.findall('.//derivativeTransaction'):
+        for trans_elem in _DERIVATIVE_TRANSACTIONS(deriv_table):
             try:
                 transaction = self._parse_derivative_transaction(
                     trans_elem, filing_info, accession_number
@@ -373,7 +453,7 @@ class Form4Parser:
     
     def _parse_derivative_transaction(
         self,
-        trans_elem: ET.Element,
+        trans_elem: etree._Element,
         filing_info: Dict[str, Any],
         accession_number: str
     ) -> Optional[InsiderTransaction]:
@@ -408,7 +488,7 @@ class Form4Parser:
             
             # Extract transaction code
             trans_coding = trans_elem.find('.//transactionCoding')
-            trans_code = self._get_text(trans_coding, './/transactionCode') if trans_coding else 'M'
+            trans_code = self._get_text(trans_coding, './/transactionCode') if trans_coding is not None and len(trans_coding) else 'M'
             trans_type = self.TRANSACTION_CODE_MAP.get(trans_code, TransactionType.OTHER)
             
             # Extract underlying security info
@@ -445,69 +525,7 @@ class Form4Parser:
             logger.error(f"Error in _parse_derivative_transaction: {e}")
             return None
     
-    def _parse_with_beautifulsoup(self, content: str, accession_number: str) -> List[InsiderTransaction]:
-        """Fallback parser using BeautifulSoup for malformed XML."""
-        transactions = []
-        
-        try:
-            soup = BeautifulSoup(content, 'xml')
-            
-            # Extract filing info
-            filing_info = {
-                'company_name': soup.find('issuerName').text if soup.find('issuerName') else None,
-                'company_cik': normalize_cik(soup.find('issuerCik').text) if soup.find('issuerCik') else None,
-                'ticker': soup.find('issuerTradingSymbol').text if soup.find('issuerTradingSymbol') else None,
-                'insider_name': soup.find('rptOwnerName').text if soup.find('rptOwnerName') else None,
-                'filing_date': datetime.now(),
-                'form_type': '4'
-            }
-            
-            if not filing_info['company_name'] or not filing_info['insider_name']:
-                return transactions
-            
-            # Extract officer title if present
-            if soup.find('officerTitle'):
-                filing_info['insider_title'] = soup.find('officerTitle').text
-            
-            # Parse non-derivative transactions
-            for trans in soup.find_all('nonDerivativeTransaction'):
-                try:
-                    shares = float(trans.find('transactionShares').find('value').text)
-                    price = trans.find('transactionPricePerShare')
-                    price_value = float(price.find('value').text) if price and price.find('value') else None
-                    
-                    transaction = InsiderTransaction(
-                        insider_name=filing_info['insider_name'],
-                        insider_title=filing_info.get('insider_title'),
-                        company_name=filing_info['company_name'],
-                        company_cik=filing_info['company_cik'],
-                        ticker=filing_info.get('ticker'),
-                        transaction_date=parse_date(trans.find('transactionDate').find('value').text),
-                        transaction_type=self.TRANSACTION_CODE_MAP.get(
-                            trans.find('transactionCode').text, TransactionType.OTHER
-                        ),
-                        security_title=trans.find('securityTitle').find('value').text,
-                        shares=shares,
-                        price_per_share=price_value,
-                        total_value=shares * price_value if price_value else None,
-                        ownership_type=OwnershipType.DIRECT,
-                        shares_owned_after=float(
-                            trans.find('sharesOwnedFollowingTransaction').find('value').text
-                        ),
-                        filing_date=filing_info['filing_date'],
-                        accession_number=accession_number,
-                        form_type=filing_info['form_type']
-                    )
-                    transactions.append(transaction)
-                except Exception as e:
-                    logger.error(f"Error parsing transaction with BeautifulSoup: {e}")
-            
-        except Exception as e:
-            logger.error(f"BeautifulSoup parsing failed for {accession_number}: {e}")
-        
-        return transactions
-    
-    def _get_text(self, element: ET.Element, path: str, default: str = None) -> Optional[str]:
+    def _get_text(self, element: etree._Element, path: str, default: str = None) -> Optional[str]:
         """Safely extract text from XML element."""
         if element is None:
             return default
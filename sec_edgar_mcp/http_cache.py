@@ -0,0 +1,137 @@
+"""Compressed on-disk cache for fetched SEC documents."""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .config import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# How often a namespace is swept for expired entries and trimmed to its size limit
+_SWEEP_INTERVAL = 3600
+
+
+class FileCache:
+    """
+    Gzip-compressed files keyed by URL, expiring ``ttl`` after they were written.
+    
+    Filings under the Archives path never change once published, so a hit
+    saves both the round trip and the rate-limiter slot. Entries stored with
+    HTTP validators (ETag, Last-Modified) outlive their ttl so that mutable
+    documents can be revalidated with a conditional request instead.
+    
+    Writes periodically sweep the namespace: expired entries without
+    validators are removed, then the oldest entries are evicted until the
+    namespace fits in ``max_bytes``.
+    """
+    
+    def __init__(self, namespace: str, ttl: timedelta = timedelta(days=7),
+                 max_bytes: int = 1 << 30):
+        self.namespace = namespace
+        self.ttl = ttl.total_seconds()
+        self.max_bytes = max_bytes
+        self._last_sweep = 0.0
+    
+    def _path(self, url: str) -> Path:
+        # Resolved per call so importing a module that owns a cache never touches the disk
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return get_cache_dir('http', self.namespace) / key[:2] / f"{key}.gz"
+    
+    def _meta_path(self, path: Path) -> Path:
+        return path.with_suffix('.meta')
+    
+    def get(self, url: str) -> Optional[bytes]:
+        """Return the cached body for a URL, or None if missing or expired."""
+        try:
+            path = self._path(url)
+            if time.time() - path.stat().st_mtime > self.ttl:
+                # Keep expired entries that can still be revalidated
+                if not self._meta_path(path).exists():
+                    path.unlink(missing_ok=True)
+                return None
+            return gzip.decompress(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError) as e:
+            logger.debug(f"HTTP cache read failed for {url}: {e}")
+            return None
+    
+    def get_stale(self, url: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Return the body and validators stored for a URL regardless of age, if it has validators."""
+        try:
+            path = self._path(url)
+            validators = json.loads(self._meta_path(path).read_text())
+            return gzip.decompress(path.read_bytes()), validators
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            logger.debug(f"HTTP cache read failed for {url}: {e}")
+            return None
+    
+    def touch(self, url: str):
+        """Restart the ttl of an entry the server confirmed is unchanged."""
+        try:
+            self._path(url).touch()
+        except OSError as e:
+            logger.debug(f"HTTP cache touch failed for {url}: {e}")
+    
+    def set(self, url: str, data: bytes, validators: Optional[Dict[str, str]] = None):
+        """Store a body for a URL, replacing any previous entry atomically."""
+        try:
+            path = self._path(url)
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp, path)
+            
+            meta_path = self._meta_path(path)
+            if validators:
+                meta_path.write_text(json.dumps(validators))
+            else:
+                meta_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"HTTP cache write failed for {url}: {e}")
+            return
+        
+        if time.time() - self._last_sweep > _SWEEP_INTERVAL:
+            self._last_sweep = time.time()
+            self.sweep()
+    
+    def sweep(self):
+        """Drop expired entries and evict the oldest ones beyond ``max_bytes``."""
+        try:
+            root = get_cache_dir('http', self.namespace)
+            now = time.time()
+            entries = []
+            total = 0
+            for path in root.glob('*/*.gz'):
+                try:
+                    stat = path.stat()
+                    meta_path = self._meta_path(path)
+                    if now - stat.st_mtime > self.ttl and not meta_path.exists():
+                        path.unlink(missing_ok=True)
+                        continue
+                    size = stat.st_size + (meta_path.stat().st_size if meta_path.exists() else 0)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, size, path))
+                total += size
+            
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                self._meta_path(path).unlink(missing_ok=True)
+                total -= size
+        except OSError as e:
+            logger.debug(f"HTTP cache sweep failed for {self.namespace}: {e}")
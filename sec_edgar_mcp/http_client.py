@@ -0,0 +1,119 @@
+"""Process-wide HTTP session shared by the SEC EDGAR tools."""
+
+import functools
+import logging
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from secedgar.client import NetworkClient
+
+from .http_cache import FileCache
+from .utils import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Threads one lookup uses to download filings; the rate limiter still caps the request rate
+FETCH_WORKERS = 8
+
+# Sized for the concurrent lookups in server.py plus the parsers' thread pools,
+# and never below one lookup's fetch threads so each keeps its keep-alive connection
+POOL_MAXSIZE = max(20, FETCH_WORKERS)
+
+# (connect, read) seconds, applied when a caller doesn't pass its own timeout
+DEFAULT_TIMEOUT = (3.05, 30)
+
+# Connection failures are retried with backoff; idempotent methods only, so search POSTs are not
+RETRIES = Retry(total=3, backoff_factor=0.5)
+
+# secedgar's documented ceiling, which SEC allows per user agent
+SECEDGAR_RATE_LIMIT = 10
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that fills in DEFAULT_TIMEOUT for requests made without one."""
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+
+
+def get_session() -> requests.Session:
+    """
+    Return the shared session, creating it on first use.
+
+    Every request through it reuses pooled keep-alive connections to sec.gov
+    and data.sec.gov instead of paying a new TCP and TLS handshake. The
+    User-Agent differs per tool call, so callers pass it in their headers.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = _TimeoutHTTPAdapter(
+                    pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=RETRIES
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+@functools.lru_cache(maxsize=32)
+def get_secedgar_client(user_agent: str) -> NetworkClient:
+    """
+    Return the long-lived secedgar client for a user agent.
+    
+    ``filings`` and ``CIKLookup`` build a fresh NetworkClient whenever they are
+    only given a user agent; passing this one as ``client=`` keeps a single
+    client, and its rate limit, per user agent for the life of the process.
+    """
+    return NetworkClient(user_agent=user_agent, rate_limit=SECEDGAR_RATE_LIMIT)
+
+
+def cached_get(
+    cache: FileCache,
+    url: str,
+    headers: Dict[str, str],
+    session: Optional[requests.Session] = None
+) -> bytes:
+    """
+    GET a URL through a FileCache, revalidating expired entries.
+    
+    Fresh entries are returned without a request. Once an entry expires it is
+    revalidated with If-None-Match / If-Modified-Since, so documents that do
+    change (submissions JSON) only transfer a body when SEC has a new one.
+    Network requests take a slot from the shared rate limiter.
+    """
+    data = cache.get(url)
+    if data is not None:
+        return data
+    
+    request_headers = dict(headers)
+    stale = cache.get_stale(url)
+    if stale is not None:
+        validators = stale[1]
+        if 'etag' in validators:
+            request_headers['If-None-Match'] = validators['etag']
+        if 'last_modified' in validators:
+            request_headers['If-Modified-Since'] = validators['last_modified']
+    
+    rate_limiter.wait_if_needed()
+    response = (session or get_session()).get(url, headers=request_headers)
+    if response.status_code == 304 and stale is not None:
+        cache.touch(url)
+        return stale[0]
+    response.raise_for_status()
+    
+    validators = {}
+    if response.headers.get('ETag'):
+        validators['etag'] = response.headers['ETag']
+    if response.headers.get('Last-Modified'):
+        validators['last_modified'] = response.headers['Last-Modified']
+    cache.set(url, response.content, validators)
+    return response.content
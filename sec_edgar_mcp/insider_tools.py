@@ -1,12 +1,22 @@
 """MCP tools for insider trading analysis using SEC Form 4 filings."""
 
+import functools
+import heapq
+import json
 import logging
-from typing import List, Dict, Any, Optional, Union
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, date, timedelta
 from secedgar import filings, FilingType
+from secedgar.cik_lookup import CIKLookup
 from mcp.server.fastmcp import FastMCP
 
 from .form4_parser import Form4Parser
+from .bulk import load_company_tickers, load_submissions
+from .http_cache import FileCache
+from .http_client import FETCH_WORKERS, get_secedgar_client
 from .models import InsiderTransaction
 from .utils import (
     normalize_cik, normalize_ticker, cached, rate_limited,
@@ -16,6 +26,214 @@ from .config import initialize_config
 
 logger = logging.getLogger(__name__)
 
+# Primary XML document listed in a filing index; matched on the undecoded index bytes
+_FILENAME_RE = re.compile(rb'<FILENAME>([^<\n]+\.xml)', re.IGNORECASE)
+
+# Filing index URL -> its Form 4 XML URL; published filings never change
+_xml_url_cache = FileCache('form4_xml_urls', ttl=timedelta(days=365))
+
+# Transaction types counted as shares bought in the summaries
+_BUY_TYPES = frozenset({"PURCHASE", "EXERCISE"})
+
+
+@functools.lru_cache(maxsize=4)
+def _ticker_ciks(user_agent: str) -> Dict[str, str]:
+    """Ticker -> CIK map built once from the shared company_tickers.json."""
+    return {
+        entry['ticker'].upper(): str(entry['cik_str'])
+        for entry in json.loads(load_company_tickers(user_agent)).values()
+        if entry.get('ticker')
+    }
+
+
+@functools.lru_cache(maxsize=1024)
+def ticker_to_cik(lookup: str, user_agent: str) -> Optional[str]:
+    """
+    Resolve a ticker, company name or CIK to a CIK, remembering the answer.
+    
+    Tickers are answered from the shared ticker map. Anything else costs
+    secedgar a browse-edgar request; passing the resolved CIK on to
+    ``filings`` keeps that to one per lookup.
+    """
+    try:
+        cik = _ticker_ciks(user_agent).get(lookup.upper())
+        if cik:
+            return cik
+    except Exception as e:
+        logger.debug(f"Ticker map unavailable, falling back to secedgar: {e}")
+    return CIKLookup(lookup, client=get_secedgar_client(user_agent)).lookup_dict.get(lookup)
+
+
+def _form4_urls_from_submissions(cik: str, start: date, end: date, user_agent: str) -> Optional[List[str]]:
+    """
+    List a company's Form 4 URLs between start and end from its submissions index.
+    
+    One (usually cached) JSON document replaces the EDGAR pages secedgar walks.
+    Filings with an XML primary document are linked to the XML itself, so no
+    index page has to be read to find it. Returns None when the index can't
+    answer: fetch errors, or a window reaching past the recent filings.
+    """
+    try:
+        data = load_submissions(normalize_cik(cik), user_agent)
+        filings_index = json.loads(data)['filings']
+        recent = filings_index['recent']
+        forms, filing_dates = recent['form'], recent['filingDate']
+        accessions, primary_documents = recent['accessionNumber'], recent['primaryDocument']
+    except Exception as e:
+        logger.debug(f"Submissions lookup failed for CIK {cik}: {e}")
+        return None
+    
+    start_iso, end_iso = start.isoformat(), end.isoformat()
+    
+    # Older filings live in separate files; only the recent block is read
+    oldest = min(filing_dates, default=None)
+    if filings_index.get('files') and (oldest is None or start_iso < oldest):
+        return None
+    
+    filing_urls = []
+    for form, filed, accession, primary_document in zip(forms, filing_dates, accessions, primary_documents):
+        if form not in ('4', '4/A') or not start_iso <= filed <= end_iso:
+            continue
+        # primaryDocument points at the rendered view (xslF345X05/form4.xml); the raw XML drops the prefix
+        document = primary_document.rsplit('/', 1)[-1]
+        if not document.endswith('.xml'):
+            document = f"{accession}.txt"
+        filing_urls.append(build_filing_url(cik, accession, document))
+    return filing_urls
+
+
+@cached(filing_type='form4')
+def _list_form4_urls(lookup: str, start: date, end: date, user_agent: str) -> List[str]:
+    """
+    List a company's Form 4 filing URLs between start and end, deduplicated.
+    
+    Only used when the submissions index can't answer. Enumerating filings
+    costs secedgar several EDGAR requests, so the list is cached; errors
+    propagate so a failed listing is never cached as empty.
+    """
+    company_filings = filings(
+        cik_lookup=lookup,
+        filing_type=FilingType.FILING_4,
+        client=get_secedgar_client(user_agent),
+        start_date=start,
+        end_date=end
+    )
+    
+    urls_dict = company_filings.get_urls()
+    # The URLs are returned as a dict with company as key
+    if isinstance(urls_dict, dict):
+        # Get the URLs for the first (and likely only) key
+        company_key = next(iter(urls_dict), None)
+        filing_urls = urls_dict.get(company_key, []) if company_key else []
+    else:
+        filing_urls = list(urls_dict) if urls_dict else []
+    
+    # Deduplicate URLs (secedgar sometimes returns duplicates)
+    return list(dict.fromkeys(filing_urls))  # Preserves order while removing duplicates
+
+
+def _get_filing_urls(lookup: str, start: date, end: date, user_agent: str) -> List[str]:
+    """Return the deduplicated Form 4 filing URLs for a company between start and end."""
+    cik = ticker_to_cik(lookup, user_agent)
+    if cik:
+        filing_urls = _form4_urls_from_submissions(cik, start, end, user_agent)
+        if filing_urls is not None:
+            if not filing_urls:
+                logger.info(f"No Form 4 filings for {lookup} between {start} and {end}")
+            return filing_urls
+    
+    try:
+        return _list_form4_urls(cik or lookup, start, end, user_agent)
+    except Exception as e:
+        logger.error(f"Error getting filing URLs: {e}")
+        return []
+
+
+def _resolve_form4_xml_url(parser: Form4Parser, filing_url: str) -> str:
+    """Return the Form 4 XML document URL for a filing URL, reading the index page if needed."""
+    # For Form 4, we need the primary document XML
+    # The URL might be to an index page, we need the actual Form 4 XML
+    if filing_url.endswith('.xml'):
+        return filing_url
+    
+    base_url = filing_url.rsplit('/', 1)[0]
+    cached_url = _xml_url_cache.get(filing_url)
+    if cached_url is not None:
+        return cached_url.decode('utf-8')
+    
+    # First, read the index up to the XML filename; the first document is almost always the XML
+    xml_match = parser.search_filing(filing_url, _FILENAME_RE)
+    if xml_match:
+        xml_url = f"{base_url}/{xml_match.group(1).decode('ascii', 'replace').strip()}"
+        _xml_url_cache.set(filing_url, xml_url.encode('utf-8'))
+        return xml_url
+    # Default to doc1.xml if no match
+    return f"{base_url}/doc1.xml"
+
+
+def _fetch_form4_xml(parser: Form4Parser, filing_url: str) -> Optional[bytes]:
+    xml_url = _resolve_form4_xml_url(parser, filing_url)
+    logger.debug("Fetching Form 4 document %s", xml_url)
+    return parser.fetch_filing_bytes(xml_url)
+
+
+def _iter_form4_documents(
+    parser: Form4Parser,
+    filing_urls: Iterable[str]
+) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """
+    Yield (filing_url, xml_content) pairs in the order the downloads finish.
+    
+    Fetching runs on a thread pool paced by the parser's rate limiter, so the
+    caller can parse one document while the next ones are still downloading.
+    """
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        futures = {executor.submit(_fetch_form4_xml, parser, url): url for url in filing_urls}
+        for future in as_completed(futures):
+            filing_url = futures[future]
+            try:
+                xml_content = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching filing {filing_url}: {e}")
+                continue
+            yield filing_url, xml_content
+
+
+@cached(filing_type='form4')
+def _fetch_company_form4_transactions(
+    company: str,
+    start: date,
+    end: date,
+    user_agent: str,
+    limit: int = 100
+) -> List[InsiderTransaction]:
+    """
+    Parse the most recent ``limit`` Form 4 filings for a company between start and end.
+    
+    Cached, so searches for different people (or spellings of one) at the same
+    company reuse one download and parse; callers filter the result by name.
+    """
+    parser = Form4Parser(user_agent)
+    transactions = []
+    
+    filing_urls = _get_filing_urls(company, start, end, user_agent)
+    logger.info(f"Found {len(filing_urls)} Form 4 filings for {company}")
+    
+    # Downloads (index page plus XML) run on a thread pool; each document is
+    # parsed here as soon as it arrives, while the rest are still in flight
+    for filing_url, xml_content in _iter_form4_documents(parser, filing_urls[:limit]):
+        try:
+            # Extract accession number from URL
+            accession = filing_url.split('/')[-2]
+            
+            if xml_content:
+                transactions.extend(parser.parse_form4_xml(xml_content, accession))
+        
+        except Exception as e:
+            logger.error(f"Error processing filing {filing_url}: {e}")
+    
+    return transactions
+
 
 def register_insider_tools(mcp: FastMCP, user_agent: str):
     """Register all insider trading tools with the MCP server."""
@@ -149,7 +367,6 @@ def get_insider_transactions(
 ) -> Dict[str, Any]:
     """Implementation of get_insider_transactions tool."""
     
-    parser = Form4Parser(user_agent)
     transactions = []
     
     # Parse dates - default to 2 years back to catch more transactions
@@ -158,121 +375,32 @@ def get_insider_transactions(
     
     logger.info(f"Searching for insider transactions: {person_name} at {company} from {start} to {end}")
     
+    normalized_search = person_name.lower().replace('.', '').replace(',', '').strip()
+    search_parts = normalized_search.split()
+    
     try:
         # If company is specified, search within that company
         if company:
-            # Get Form 4 filings for the company
-            company_filings = filings(
-                cik_lookup=company,
-                filing_type=FilingType.FILING_4,
-                user_agent=user_agent,
-                start_date=start,
-                end_date=end
-            )
-            
-            # Get filing URLs
-            try:
-                urls_dict = company_filings.get_urls()
-                # The URLs are returned as a dict with company as key
-                if isinstance(urls_dict, dict):
-                    # Get the URLs for the first (and likely only) key
-                    company_key = list(urls_dict.keys())[0] if urls_dict else None
-                    filing_urls = urls_dict.get(company_key, []) if company_key else []
+            # Every transaction filed for the company in the window, shared by all names searched
+            for trans in _fetch_company_form4_transactions(company, start, end, user_agent):
+                # Normalize names for comparison
+                normalized_insider = trans.insider_name.lower().replace('.', '').replace(',', '').strip()
+                
+                # Check exact match or substring match
+                if normalized_search in normalized_insider or normalized_insider in normalized_search:
+                    logger.debug("Matched transaction for %s on %s", trans.insider_name, trans.transaction_date)
+                    transactions.append(trans)
                 else:
-                    filing_urls = list(urls_dict) if urls_dict else []
-            except Exception as e:
-                logger.error(f"Error getting filing URLs: {e}")
-                filing_urls = []
-            
-            # Deduplicate URLs (secedgar sometimes returns duplicates)
-            filing_urls = list(dict.fromkeys(filing_urls))  # Preserves order while removing duplicates
-            
-            logger.info(f"Found {len(filing_urls)} Form 4 filings for {company}")
-            
-            # Process each filing
-            for i, filing_url in enumerate(filing_urls[:100]):  # Limit to recent 100 filings
-                try:
-                    # Extract accession number from URL
-                    accession = filing_url.split('/')[-2]
-                    
-                    # For Form 4, we need the primary document XML
-                    # The URL might be to an index page, we need the actual Form 4 XML
-                    if not filing_url.endswith('.xml'):
-                        # First, fetch the index to find the XML filename
-                        index_content = parser.fetch_filing_content(filing_url)
-                        if index_content and '<FILENAME>' in index_content:
-                            # Look for XML filename in the index
-                            import re
-                            xml_match = re.search(r'<FILENAME>([^<]+\.xml)', index_content)
-                            if xml_match:
-                                xml_filename = xml_match.group(1)
-                                base_url = filing_url.rsplit('/', 1)[0]
-                                xml_url = f"{base_url}/{xml_filename}"
-                            else:
-                                # Default to doc1.xml if no match
-                                base_url = filing_url.rsplit('/', 1)[0]
-                                xml_url = f"{base_url}/doc1.xml"
-                        else:
-                            # Fallback
-                            base_url = filing_url.rsplit('/', 1)[0]
-                            xml_url = f"{base_url}/doc1.xml"
-                    else:
-                        xml_url = filing_url
-                    
-                    logger.debug(f"Processing filing {i+1}/{min(len(filing_urls), 100)}: {xml_url}")
+                    # Try matching individual name parts
+                    insider_parts = normalized_insider.split()
                     
-                    # Fetch and parse filing
-                    xml_content = parser.fetch_filing_content(xml_url)
-                    if xml_content:
-                        # Check if this filing contains the person's name before parsing
-                        # Need to check both "First Last" and "Last First" formats
-                        name_parts = person_name.lower().split()
-                        xml_lower = xml_content.lower()
-                        
-                        # Check various name formats
-                        name_found = False
-                        if person_name.lower() in xml_lower:
-                            name_found = True
-                        elif len(name_parts) >= 2:
-                            # Try reversed name (Last First)
-                            reversed_name = f"{name_parts[-1]} {' '.join(name_parts[:-1])}"
-                            if reversed_name in xml_lower:
-                                name_found = True
-                            # Try just last name
-                            elif name_parts[-1] in xml_lower:
-                                name_found = True
-                        
-                        if name_found:
-                            logger.info(f"Found potential match for {person_name} in filing {accession}")
-                            filing_transactions = parser.parse_form4_xml(xml_content, accession)
-                            
-                            if filing_transactions:
-                                logger.info(f"Extracted {len(filing_transactions)} transactions from {accession}")
-                            else:
-                                logger.warning(f"No transactions extracted from {accession} despite name match")
-                            
-                            # Filter by person name (with better matching)
-                            for trans in filing_transactions:
-                                # Normalize names for comparison
-                                normalized_search = person_name.lower().replace('.', '').replace(',', '').strip()
-                                normalized_insider = trans.insider_name.lower().replace('.', '').replace(',', '').strip()
-                                
-                                # Check exact match or substring match
-                                if normalized_search in normalized_insider or normalized_insider in normalized_search:
-                                    logger.info(f"Matched transaction for {trans.insider_name} on {trans.transaction_date}")
-                                    transactions.append(trans)
-                                else:
-                                    # Try matching individual name parts
-                                    search_parts = normalized_search.split()
-                                    insider_parts = normalized_insider.split()
-                                    
-                                    # Check if all parts of search name are in insider name
-                                    if all(any(sp in ip for ip in insider_parts) for sp in search_parts):
-                                        logger.info(f"Matched transaction for {trans.insider_name} on {trans.transaction_date} (partial match)")
-                                        transactions.append(trans)
-                
-                except Exception as e:
-                    logger.error(f"Error processing filing {filing_url}: {e}")
+                    # Check if all parts of search name are in insider name
+                    if all(any(sp in ip for ip in insider_parts) for sp in search_parts):
+                        logger.debug(
+                            "Matched transaction for %s on %s (partial match)",
+                            trans.insider_name, trans.transaction_date
+                        )
+                        transactions.append(trans)
         
         else:
             # Without company filter, this is more challenging
@@ -328,7 +456,7 @@ def get_form4_details(
             xml_url = extract_xml_url(filing_url)
             
             # Fetch and parse
-            xml_content = parser.fetch_filing_content(xml_url)
+            xml_content = parser.fetch_filing_bytes(xml_url)
             if xml_content:
                 transactions = parser.parse_form4_xml(xml_content, accession_number)
                 
@@ -379,7 +507,6 @@ def get_recent_insider_activity(
 ) -> Dict[str, Any]:
     """Implementation of get_recent_insider_activity tool."""
     
-    parser = Form4Parser(user_agent)
     transactions = []
     
     # Calculate date range
@@ -387,69 +514,8 @@ def get_recent_insider_activity(
     start_date = end_date - timedelta(days=days_back)
     
     try:
-        # Get Form 4 filings for the company
-        company_filings = filings(
-            cik_lookup=company,
-            filing_type=FilingType.FILING_4,
-            user_agent=user_agent,
-            start_date=start_date,
-            end_date=end_date
-        )
-        
-        # Get filing URLs
-        try:
-            urls_dict = company_filings.get_urls()
-            # The URLs are returned as a dict with company as key
-            if isinstance(urls_dict, dict):
-                # Get the URLs for the first (and likely only) key
-                company_key = list(urls_dict.keys())[0] if urls_dict else None
-                filing_urls = urls_dict.get(company_key, []) if company_key else []
-            else:
-                filing_urls = list(urls_dict) if urls_dict else []
-        except Exception as e:
-            logger.error(f"Error getting filing URLs: {e}")
-            filing_urls = []
-        
-        # Deduplicate URLs
-        filing_urls = list(dict.fromkeys(filing_urls))
-        
-        # Process each filing
-        for filing_url in filing_urls[:50]:  # Limit to recent 50 filings
-            try:
-                # Extract accession number from URL
-                accession = filing_url.split('/')[-2]
-                
-                # For Form 4, we need the primary document XML
-                if not filing_url.endswith('.xml'):
-                    # First, fetch the index to find the XML filename
-                    index_content = parser.fetch_filing_content(filing_url)
-                    if index_content and '<FILENAME>' in index_content:
-                        # Look for XML filename in the index
-                        import re
-                        xml_match = re.search(r'<FILENAME>([^<]+\.xml)', index_content)
-                        if xml_match:
-                            xml_filename = xml_match.group(1)
-                            base_url = filing_url.rsplit('/', 1)[0]
-                            xml_url = f"{base_url}/{xml_filename}"
-                        else:
-                            # Default to doc1.xml if no match
-                            base_url = filing_url.rsplit('/', 1)[0]
-                            xml_url = f"{base_url}/doc1.xml"
-                    else:
-                        # Fallback
-                        base_url = filing_url.rsplit('/', 1)[0]
-                        xml_url = f"{base_url}/doc1.xml"
-                else:
-                    xml_url = filing_url
-                
-                # Fetch and parse filing
-                xml_content = parser.fetch_filing_content(xml_url)
-                if xml_content:
-                    filing_transactions = parser.parse_form4_xml(xml_content, accession)
-                    transactions.extend(filing_transactions)
-            
-            except Exception as e:
-                logger.error(f"Error processing filing {filing_url}: {e}")
+        # Get Form 4 transactions for the company; limit to recent 50 filings
+        transactions = list(_fetch_company_form4_transactions(company, start_date, end_date, user_agent, limit=50))
     
     except Exception as e:
         logger.error(f"Error getting recent insider activity: {e}")
@@ -464,11 +530,15 @@ def get_recent_insider_activity(
     # Sort by date
     transactions.sort(key=lambda x: x.transaction_date, reverse=True)
     
-    # Group by insider
+    # Group by insider, totalling the overall statistics in the same pass
     insider_activity = {}
+    transaction_dicts = []
+    total_bought = 0
+    total_sold = 0
     for trans in transactions:
-        if trans.insider_name not in insider_activity:
-            insider_activity[trans.insider_name] = {
+        activity = insider_activity.get(trans.insider_name)
+        if activity is None:
+            activity = insider_activity[trans.insider_name] = {
                 "title": trans.insider_title,
                 "transactions": [],
                 "total_bought": 0,
@@ -476,18 +546,19 @@ def get_recent_insider_activity(
                 "net_shares": 0
             }
         
-        insider_activity[trans.insider_name]["transactions"].append(trans.to_dict())
+        trans_dict = trans.to_dict()
+        transaction_dicts.append(trans_dict)
+        activity["transactions"].append(trans_dict)
         
-        if trans.transaction_type.name in ["PURCHASE", "EXERCISE"]:
-            insider_activity[trans.insider_name]["total_bought"] += trans.shares
-            insider_activity[trans.insider_name]["net_shares"] += trans.shares
-        elif trans.transaction_type.name == "SALE":
-            insider_activity[trans.insider_name]["total_sold"] += trans.shares
-            insider_activity[trans.insider_name]["net_shares"] -= trans.shares
-    
-    # Calculate overall statistics
-    total_bought = sum(i["total_bought"] for i in insider_activity.values())
-    total_sold = sum(i["total_sold"] for i in insider_activity.values())
+        type_name = trans.transaction_type.name
+        if type_name in _BUY_TYPES:
+            activity["total_bought"] += trans.shares
+            activity["net_shares"] += trans.shares
+            total_bought += trans.shares
+        elif type_name == "SALE":
+            activity["total_sold"] += trans.shares
+            activity["net_shares"] -= trans.shares
+            total_sold += trans.shares
     
     return {
         "company": company,
@@ -505,7 +576,7 @@ def get_recent_insider_activity(
             "buy_sell_ratio": total_bought / total_sold if total_sold > 0 else float('inf')
         },
         "insiders": insider_activity,
-        "recent_transactions": [t.to_dict() for t in transactions[:20]]  # Top 20 most recent
+        "recent_transactions": transaction_dicts[:20]  # Top 20 most recent
     }
 
 
@@ -556,22 +627,22 @@ def analyze_insider_patterns(
         for name, data in activity["insiders"].items()
     ]
     
-    patterns["most_active_insiders"] = sorted(
+    patterns["most_active_insiders"] = heapq.nlargest(
+        10,
         insider_list,
-        key=lambda x: x["transaction_count"],
-        reverse=True
-    )[:10]
+        key=lambda x: x["transaction_count"]
+    )
     
     # Find largest transactions
-    all_transactions = []
-    for insider_data in activity["insiders"].values():
-        all_transactions.extend(insider_data["transactions"])
+    all_transactions = chain.from_iterable(
+        insider_data["transactions"] for insider_data in activity["insiders"].values()
+    )
     
-    patterns["largest_transactions"] = sorted(
+    patterns["largest_transactions"] = heapq.nlargest(
+        10,
         all_transactions,
-        key=lambda x: x.get("total_value", 0) or 0,
-        reverse=True
-    )[:10]
+        key=lambda x: x.get("total_value", 0) or 0
+    )
     
     return patterns
 
@@ -590,23 +661,23 @@ def calculate_insider_summary(transactions: List[InsiderTransaction]) -> Dict[st
             "net_value": 0
         }
     
-    bought_shares = sum(
-        t.shares for t in transactions 
-        if t.transaction_type.name in ["PURCHASE", "EXERCISE"]
-    )
-    sold_shares = sum(
-        t.shares for t in transactions 
-        if t.transaction_type.name == "SALE"
-    )
-    
-    bought_value = sum(
-        t.total_value or 0 for t in transactions 
-        if t.transaction_type.name in ["PURCHASE", "EXERCISE"] and t.total_value
-    )
-    sold_value = sum(
-        t.total_value or 0 for t in transactions 
-        if t.transaction_type.name == "SALE" and t.total_value
-    )
+    # One pass over the transactions for every total and the date range
+    bought_shares = sold_shares = 0
+    bought_value = sold_value = 0
+    first_date = last_date = transactions[0].transaction_date
+    for t in transactions:
+        type_name = t.transaction_type.name
+        if type_name in _BUY_TYPES:
+            bought_shares += t.shares
+            bought_value += t.total_value or 0
+        elif type_name == "SALE":
+            sold_shares += t.shares
+            sold_value += t.total_value or 0
+        
+        if t.transaction_date < first_date:
+            first_date = t.transaction_date
+        elif t.transaction_date > last_date:
+            last_date = t.transaction_date
     
     return {
         "total_transactions": len(transactions),
@@ -619,7 +690,7 @@ def calculate_insider_summary(transactions: List[InsiderTransaction]) -> Dict[st
         "average_buy_price": bought_value / bought_shares if bought_shares > 0 else None,
         "average_sell_price": sold_value / sold_shares if sold_shares > 0 else None,
         "date_range": {
-            "first": min(t.transaction_date for t in transactions).isoformat(),
-            "last": max(t.transaction_date for t in transactions).isoformat()
+            "first": first_date.isoformat(),
+            "last": last_date.isoformat()
         }
     }
\ No newline at end of file
@@ -7,6 +7,7 @@ import xml.etree.ElementTree as ET
 from secedgar import filings, FilingType
 from mcp.server.fastmcp import FastMCP
 
+from .http_client import get_secedgar_client
 from .models import InstitutionalHolding, MajorShareholder
 from .utils import (
     normalize_cik, normalize_ticker, cached, rate_limited,
@@ -146,7 +147,7 @@ def get_13f_holdings(
         inst_filings = filings(
             cik_lookup=institution,
             filing_type=FilingType.FILING_13FHR,
-            user_agent=user_agent,
+            client=get_secedgar_client(user_agent),
             count=4  # Get last 4 quarters
         )
         
@@ -225,7 +226,7 @@ def get_major_shareholders(
         filings_13d = filings(
             cik_lookup=company,
             filing_type=FilingType.FILING_SC13D,
-            user_agent=user_agent,
+            client=get_secedgar_client(user_agent),
             count=20
         )
         
@@ -233,7 +234,7 @@ def get_major_shareholders(
         filings_13g = filings(
             cik_lookup=company,
             filing_type=FilingType.FILING_SC13G,
-            user_agent=user_agent,
+            client=get_secedgar_client(user_agent),
             count=20
         )
         
@@ -1,11 +1,15 @@
 """Data models for SEC EDGAR MCP server."""
 
 from dataclasses import dataclass
+from operator import methodcaller
 from typing import List, Optional, Dict, Any
 from datetime import date, datetime
 from enum import Enum
 
 
+_to_dict = methodcaller('to_dict')
+
+
 class TransactionType(Enum):
     """Types of insider transactions."""
     PURCHASE = "P"
@@ -86,6 +90,15 @@ class InsiderTransaction:
         }
 
 
+# Field order of InstitutionalHolding.as_tuple(), used to build its dict form
+_IH_KEYS = (
+    "institution_name", "institution_cik", "report_date", "security_name",
+    "security_cusip", "shares_held", "market_value", "percentage_of_portfolio",
+    "percentage_of_company", "change_in_shares", "change_percentage",
+    "filing_date", "accession_number"
+)
+
+
 @dataclass
 class InstitutionalHolding:
     """Represents institutional holdings from 13F filings."""
@@ -103,23 +116,27 @@ class InstitutionalHolding:
     filing_date: datetime
     accession_number: str
     
+    def as_tuple(self) -> tuple:
+        """Return field values in ``_IH_KEYS`` order with dates ISO-formatted."""
+        return (
+            self.institution_name,
+            self.institution_cik,
+            self.report_date.isoformat(),
+            self.security_name,
+            self.security_cusip,
+            self.shares_held,
+            self.market_value,
+            self.percentage_of_portfolio,
+            self.percentage_of_company,
+            self.change_in_shares,
+            self.change_percentage,
+            self.filing_date.isoformat(),
+            self.accession_number
+        )
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return {
-            "institution_name": self.institution_name,
-            "institution_cik": self.institution_cik,
-            "report_date": self.report_date.isoformat(),
-            "security_name": self.security_name,
-            "security_cusip": self.security_cusip,
-            "shares_held": self.shares_held,
-            "market_value": self.market_value,
-            "percentage_of_portfolio": self.percentage_of_portfolio,
-            "percentage_of_company": self.percentage_of_company,
-            "change_in_shares": self.change_in_shares,
-            "change_percentage": self.change_percentage,
-            "filing_date": self.filing_date.isoformat(),
-            "accession_number": self.accession_number
-        }
+        return dict(zip(_IH_KEYS, self.as_tuple()))
 
 
 @dataclass
@@ -289,13 +306,13 @@ class EntityActivityReport:
             "entity_type": self.entity_type,
             "analysis_period_start": self.analysis_period_start.isoformat(),
             "analysis_period_end": self.analysis_period_end.isoformat(),
-            "recent_filings": [f.to_dict() for f in self.recent_filings],
-            "insider_transactions": [t.to_dict() for t in self.insider_transactions],
-            "institutional_holdings": [h.to_dict() for h in self.institutional_holdings],
-            "major_shareholders": [s.to_dict() for s in self.major_shareholders],
-            "material_events": [e.to_dict() for e in self.material_events],
-            "revenue_segments": [r.to_dict() for r in self.revenue_segments],
-            "geographic_revenue": [g.to_dict() for g in self.geographic_revenue],
+            "recent_filings": list(map(_to_dict, self.recent_filings)),
+            "insider_transactions": list(map(_to_dict, self.insider_transactions)),
+            "institutional_holdings": list(map(_to_dict, self.institutional_holdings)),
+            "major_shareholders": list(map(_to_dict, self.major_shareholders)),
+            "material_events": list(map(_to_dict, self.material_events)),
+            "revenue_segments": list(map(_to_dict, self.revenue_segments)),
+            "geographic_revenue": list(map(_to_dict, self.geographic_revenue)),
             "summary_statistics": self.summary_statistics
         }
 
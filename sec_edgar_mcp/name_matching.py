@@ -2,12 +2,20 @@
 
 import re
 import logging
-from typing import List, Dict, Any, Optional, Tuple, Set
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple, Set, FrozenSet, ClassVar, Mapping
 from dataclasses import dataclass
 from difflib import SequenceMatcher
 
 logger = logging.getLogger(__name__)
 
+_WS_RE = re.compile(r'\s+')
+_PUNCT_RE = re.compile(r'[.,;:!?]')
+
+# Similarity at or above which two names are taken to refer to the same person
+NAME_MATCH_THRESHOLD = 0.8
+
 
 @dataclass
 class NameVariation:
@@ -25,47 +33,51 @@ class IntelligentNameMatcher:
     Addresses the limitation where "Gale Klappa" vs "KLAPPA GALE E" wouldn't match.
     """
     
-    def __init__(self):
-        # Common name prefixes and suffixes
-        self.prefixes = {
-            'mr', 'mrs', 'ms', 'dr', 'prof', 'sir', 'dame', 'lord', 'lady',
-            'rev', 'father', 'sister', 'brother'
-        }
-        
-        self.suffixes = {
-            'jr', 'sr', 'ii', 'iii', 'iv', 'esq', 'md', 'phd', 'jd', 'cpa',
-            'cfa', 'mba', 'pe', 'rn'
-        }
-        
-        # Common nickname mappings
-        self.nickname_map = {
-            'bill': 'william', 'billy': 'william', 'will': 'william',
-            'bob': 'robert', 'bobby': 'robert', 'rob': 'robert', 'robbie': 'robert',
-            'dick': 'richard', 'rick': 'richard', 'ricky': 'richard', 'rich': 'richard',
-            'jim': 'james', 'jimmy': 'james', 'jamie': 'james',
-            'mike': 'michael', 'micky': 'michael', 'mickey': 'michael',
-            'dave': 'david', 'davey': 'david',
-            'steve': 'steven', 'stevie': 'steven',
-            'chris': 'christopher', 'christi': 'christopher',
-            'dan': 'daniel', 'danny': 'daniel',
-            'tom': 'thomas', 'tommy': 'thomas',
-            'tony': 'anthony', 'ant': 'anthony',
-            'joe': 'joseph', 'joey': 'joseph',
-            'ben': 'benjamin', 'benny': 'benjamin',
-            'sam': 'samuel', 'sammy': 'samuel',
-            'matt': 'matthew', 'matty': 'matthew',
-            'nick': 'nicholas', 'nicky': 'nicholas',
-            'andy': 'andrew', 'drew': 'andrew',
-            'greg': 'gregory', 'greggy': 'gregory',
-            'pat': 'patricia', 'patty': 'patricia', 'patti': 'patricia',
-            'liz': 'elizabeth', 'beth': 'elizabeth', 'betty': 'elizabeth', 'betsy': 'elizabeth',
-            'sue': 'susan', 'susie': 'susan', 'suzy': 'susan',
-            'kathy': 'katherine', 'kate': 'katherine', 'katie': 'katherine', 'kit': 'katherine',
-            'jen': 'jennifer', 'jenny': 'jennifer', 'jenn': 'jennifer',
-            'amy': 'amelia', 'mel': 'amelia', 'melly': 'amelia'
-        }
+    # Common name prefixes and suffixes
+    prefixes: ClassVar[FrozenSet[str]] = frozenset({
+        'mr', 'mrs', 'ms', 'dr', 'prof', 'sir', 'dame', 'lord', 'lady',
+        'rev', 'father', 'sister', 'brother'
+    })
+    
+    suffixes: ClassVar[FrozenSet[str]] = frozenset({
+        'jr', 'sr', 'ii', 'iii', 'iv', 'esq', 'md', 'phd', 'jd', 'cpa',
+        'cfa', 'mba', 'pe', 'rn'
+    })
     
+    # Common nickname mappings
+    nickname_map: ClassVar[Mapping[str, str]] = MappingProxyType({
+        'bill': 'william', 'billy': 'william', 'will': 'william',
+        'bob': 'robert', 'bobby': 'robert', 'rob': 'robert', 'robbie': 'robert',
+        'dick': 'richard', 'rick': 'richard', 'ricky': 'richard', 'rich': 'richard',
+        'jim': 'james', 'jimmy': 'james', 'jamie': 'james',
+        'mike': 'michael', 'micky': 'michael', 'mickey': 'michael',
+        'dave': 'david', 'davey': 'david',
+        'steve': 'steven', 'stevie': 'steven',
+        'chris': 'christopher', 'christi': 'christopher',
+        'dan': 'daniel', 'danny': 'daniel',
+        'tom': 'thomas', 'tommy': 'thomas',
+        'tony': 'anthony', 'ant': 'anthony',
+        'joe': 'joseph', 'joey': 'joseph',
+        'ben': 'benjamin', 'benny': 'benjamin',
+        'sam': 'samuel', 'sammy': 'samuel',
+        'matt': 'matthew', 'matty': 'matthew',
+        'nick': 'nicholas', 'nicky': 'nicholas',
+        'andy': 'andrew', 'drew': 'andrew',
+        'greg': 'gregory', 'greggy': 'gregory',
+        'pat': 'patricia', 'patty': 'patricia', 'patti': 'patricia',
+        'liz': 'elizabeth', 'beth': 'elizabeth', 'betty': 'elizabeth', 'betsy': 'elizabeth',
+        'sue': 'susan', 'susie': 'susan', 'suzy': 'susan',
+        'kathy': 'katherine', 'kate': 'katherine', 'katie': 'katherine', 'kit': 'katherine',
+        'jen': 'jennifer', 'jenny': 'jennifer', 'jenn': 'jennifer',
+        'amy': 'amelia', 'mel': 'amelia', 'melly': 'amelia'
+    })
+    
+    @lru_cache(maxsize=8192)
     def normalize_name(self, name: str) -> str:
+        """Cached ``_normalize`` for the short name strings compared in loops."""
+        return self._normalize(name)
+    
+    def _normalize(self, name: str) -> str:
         """
         Normalize a name by removing prefixes/suffixes and standardizing format.
         
@@ -78,10 +90,10 @@ class IntelligentNameMatcher:
             return ""
         
         # Convert to lowercase and remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', name.lower().strip())
+        normalized = _WS_RE.sub(' ', name.lower().strip())
         
         # Remove punctuation
-        normalized = re.sub(r'[.,;:!?]', '', normalized)
+        normalized = _PUNCT_RE.sub('', normalized)
         
         # Handle comma-separated format ("Last, First Middle")
         if ',' in normalized:
@@ -93,24 +105,23 @@ class IntelligentNameMatcher:
                 normalized = f"{' '.join(first_parts)} {last_name}"
         
         # Split into words
-        words = normalized.split()
+        words: List[str] = normalized.split()
+        start = 0
+        end = len(words)
         
         # Remove prefixes
-        while words and words[0] in self.prefixes:
-            words.pop(0)
+        while start < end and words[start] in self.prefixes:
+            start += 1
         
         # Remove suffixes
-        while words and words[-1] in self.suffixes:
-            words.pop()
+        while end > start and words[end - 1] in self.suffixes:
+            end -= 1
         
         # Remove single letters (middle initials)
-        words = [word for word in words if len(word) > 1]
-        
-        # Convert nicknames to full names
-        words = [self.nickname_map.get(word, word) for word in words]
+        normalized = ' '.join([word for word in words[start:end] if len(word) > 1])
         
-        # Return normalized name
-        return ' '.join(words)
+        # Convert nicknames to full names in one scan over the joined name
+        return _NICKNAME_RE.sub(_expand_nickname, normalized)
     
     def calculate_similarity(self, name1: str, name2: str) -> float:
         """Calculate similarity score between two names (0.0 to 1.0)."""
@@ -118,50 +129,164 @@ class IntelligentNameMatcher:
             return 0.0
         
         # Normalize both names
-        norm1 = self.normalize_name(name1)
-        norm2 = self.normalize_name(name2)
-        
+        norm1, words1 = self.normalized_tokens(name1)
+        norm2, words2 = self.normalized_tokens(name2)
+        return self._similarity_of_norm(norm1, norm2, words1, words2)
+    
+    @lru_cache(maxsize=8192)
+    def normalized_tokens(self, name: str) -> Tuple[str, FrozenSet[str]]:
+        """Normalized name plus its word set, computed once per distinct name."""
+        normalized = self.normalize_name(name)
+        return normalized, frozenset(normalized.split())
+    
+    @lru_cache(maxsize=8192)
+    def _similarity_of_norm(self, norm1: str, norm2: str, words1: FrozenSet[str], words2: FrozenSet[str]) -> float:
+        """Similarity of two already-normalized names and their word sets."""
         if norm1 == norm2:
             return 1.0
         
-        # Check for partial matches
-        words1 = set(norm1.split())
-        words2 = set(norm2.split())
-        
-        if words1 and words2:
-            # Calculate Jaccard similarity (intersection over union)
+        # Check for partial matches; require at least 2 words to match for names
+        if len(words1) >= 2 and len(words2) >= 2:
             intersection = len(words1 & words2)
-            union = len(words1 | words2)
-            jaccard = intersection / union if union > 0 else 0.0
-            
-            # Require at least 2 words to match for names
             if intersection >= 2:
-                return jaccard
+                # Jaccard similarity (intersection over union)
+                return intersection / (len(words1) + len(words2) - intersection)
         
-        # Use sequence matching as fallback
-        sequence_similarity = SequenceMatcher(None, norm1, norm2).ratio()
+        # Use sequence matching as fallback. The quick ratios are cheap upper
+        # bounds on ratio(), so skip the full comparison when they rule out > 0.8
+        matcher = SequenceMatcher(None, norm1, norm2)
+        if matcher.real_quick_ratio() <= 0.8 or matcher.quick_ratio() <= 0.8:
+            return 0.0
+        sequence_similarity = matcher.ratio()
         
         # Return higher score if above threshold
         return sequence_similarity if sequence_similarity > 0.8 else 0.0
     
-    def is_name_match(self, name1: str, name2: str, threshold: float = 0.8) -> bool:
+    @staticmethod
+    def _similarity_upper_bound(norm1: str, norm2: str, words1: FrozenSet[str], words2: FrozenSet[str]) -> float:
+        """Cheap ceiling on ``_similarity_of_norm`` for two different names, from sizes alone."""
+        bound = 0.0
+        if len(words1) >= 2 and len(words2) >= 2:
+            # Jaccard can't exceed the ratio of the smaller word set to the larger
+            bound = min(len(words1), len(words2)) / max(len(words1), len(words2))
+        total = len(norm1) + len(norm2)
+        if total:
+            # SequenceMatcher.ratio() is at most 2 * shorter / total, and only counts above 0.8
+            ratio_bound = 2 * min(len(norm1), len(norm2)) / total
+            if ratio_bound > 0.8:
+                bound = max(bound, ratio_bound)
+        return bound
+    
+    def is_name_match(self, name1: str, name2: str, threshold: float = NAME_MATCH_THRESHOLD) -> bool:
         """Check if two names refer to the same person."""
+        if name1 and name2 and threshold > 0:
+            norm1, words1 = self.normalized_tokens(name1)
+            norm2, words2 = self.normalized_tokens(name2)
+            if norm1 != norm2 and self._similarity_upper_bound(norm1, norm2, words1, words2) < threshold:
+                return False
+        
         similarity = self.calculate_similarity(name1, name2)
         return similarity >= threshold
+    
+    def similarities(self, name: str, candidates: List[str], threshold: float = NAME_MATCH_THRESHOLD) -> List[float]:
+        """
+        Score one name against many candidates, normalizing ``name`` only once.
+        
+        Candidates whose size alone keeps them below ``threshold`` score 0.0
+        without a full comparison, as in ``is_name_match``.
+        """
+        if not name:
+            return [0.0] * len(candidates)
+        
+        norm, words = self.normalized_tokens(name)
+        scores = []
+        for candidate in candidates:
+            if not candidate:
+                scores.append(0.0)
+                continue
+            cand_norm, cand_words = self.normalized_tokens(candidate)
+            if norm != cand_norm and self._similarity_upper_bound(norm, cand_norm, words, cand_words) < threshold:
+                scores.append(0.0)
+                continue
+            scores.append(self._similarity_of_norm(norm, cand_norm, words, cand_words))
+        return scores
+
+
+# Whole-word nickname alternation, longest first; a word is whitespace-delimited
+_NICKNAME_RE = re.compile(
+    r'(?<!\S)(?:'
+    + '|'.join(sorted(IntelligentNameMatcher.nickname_map, key=len, reverse=True))
+    + r')(?!\S)'
+)
+
+
+def _expand_nickname(match: re.Match) -> str:
+    return IntelligentNameMatcher.nickname_map[match.group(0)]
 
 
 # Global instance for easy access
 name_matcher = IntelligentNameMatcher()
 
 
-def smart_name_search(search_name: str, content: str, threshold: float = 0.8) -> bool:
+def name_key(name: str) -> str:
+    """
+    Order-insensitive key for a name: its normalized words, sorted.
+    
+    "Gale Klappa" and "KLAPPA GALE E" both map to "gale klappa". Uncached, so
+    it suits bulk indexing of many distinct names.
+    """
+    return ' '.join(sorted(name_matcher._normalize(name).split()))
+
+# Full name -> nicknames that normalize to it
+_NICKNAMES_BY_NAME: Dict[str, List[str]] = {}
+for _nickname, _full_name in IntelligentNameMatcher.nickname_map.items():
+    _NICKNAMES_BY_NAME.setdefault(_full_name, []).append(_nickname)
+
+# Punctuation and single-letter initials allowed between name words
+_NAME_GAP = r'(?:[\s.,;:!?]+\w)*[\s.,;:!?]+'
+
+
+@lru_cache(maxsize=1024)
+def _name_in_text_pattern(normalized_name: str) -> re.Pattern:
+    """
+    Pattern locating a normalized name in lowercase raw text.
+    
+    Each word also matches its nicknames, and words may be separated by
+    punctuation or middle initials -- the differences normalize_name folds away.
+    """
+    words = []
+    for word in normalized_name.split():
+        alternatives = [word, *_NICKNAMES_BY_NAME.get(word, [])]
+        words.append('(?:' + '|'.join(re.escape(a) for a in alternatives) + ')')
+    return re.compile(r'(?<!\w)' + _NAME_GAP.join(words) + r'(?!\w)')
+
+
+def smart_name_search(search_name: str, content: str, threshold: float = NAME_MATCH_THRESHOLD) -> bool:
     """Search for a person's name in content using intelligent matching."""
     
-    # Direct text search with normalized names
+    # Normalize only the search name; the content is searched as-is
     normalized_search = name_matcher.normalize_name(search_name)
-    normalized_content = name_matcher.normalize_name(content)
+    if not normalized_search:
+        return False
+    
+    return _name_in_text_pattern(normalized_search).search(content.lower()) is not None
+
+
+@lru_cache(maxsize=1024)
+def _name_variation_pattern(person_name: str) -> Optional[re.Pattern]:
+    """Single alternation over the common "first last" / "last, first" orderings."""
+    words = name_matcher.normalize_name(person_name).split()
+    if len(words) < 2:
+        return None
     
-    return normalized_search in normalized_content
+    first_name = words[0]
+    last_name = words[-1]
+    variations = [
+        f"{first_name} {last_name}",
+        f"{last_name}, {first_name}",
+        f"{last_name} {first_name}",
+    ]
+    return re.compile('|'.join(re.escape(v) for v in variations))
 
 
 def enhance_name_matching_in_search(person_name: str, xml_content: str) -> bool:
@@ -171,27 +296,14 @@ def enhance_name_matching_in_search(person_name: str, xml_content: str) -> bool:
     if smart_name_search(person_name, xml_content):
         return True
     
-    # Try different name formats
-    normalized_name = name_matcher.normalize_name(person_name)
-    words = normalized_name.split()
+    # Try different name formats in one pass over the content
+    pattern = _name_variation_pattern(person_name)
+    if pattern is None:
+        return False
     
-    if len(words) >= 2:
-        first_name = words[0]
-        last_name = words[-1]
-        
-        # Check various formats
-        variations = [
-            f"{first_name} {last_name}",
-            f"{last_name}, {first_name}",
-            f"{last_name} {first_name}",
-            f"{last_name.upper()}, {first_name.upper()}",
-        ]
-        
-        xml_lower = xml_content.lower()
-        
-        for variation in variations:
-            if variation.lower() in xml_lower:
-                logger.debug(f"Name variation match: '{person_name}' found as '{variation}'")
-                return True
+    match = pattern.search(xml_content.lower())
+    if match:
+        logger.debug(f"Name variation match: '{person_name}' found as '{match.group(0)}'")
+        return True
     
-    return False
\ No newline at end of file
+    return False
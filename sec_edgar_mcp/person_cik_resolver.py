@@ -3,16 +3,150 @@
 import logging
 import re
 import json
-from typing import Optional, Dict, List, Any
-from datetime import date, timedelta
+import sqlite3
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from typing import Optional, Dict, FrozenSet, List, Any, Tuple
+from datetime import date, datetime, timedelta
 import requests
+from lxml import etree
 
-from .utils import rate_limited, cached
-from .sec_fulltext_search import SECFullTextSearcher, generate_name_variations
-from .name_matching import name_matcher
+from .bulk import ensure_bulk_index, find_filers_by_name, load_submissions
+from .config import get_cache_dir, use_local_data
+from .http_client import get_session
+from .utils import rate_limited
+from .sec_fulltext_search import FilingHit, SECFullTextSearcher, generate_name_variations
+from .name_matching import name_key, name_matcher
 
 logger = logging.getLogger(__name__)
 
+_NONWORD_RE = re.compile(r'[^\w\s]')
+
+
+@lru_cache(maxsize=8192)
+def _name_words(name: str) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """Uppercased, punctuation-free words of a name, in order and as a set."""
+    words = tuple(_NONWORD_RE.sub('', name.upper()).split())
+    return words, frozenset(words)
+
+
+@lru_cache(maxsize=4096)
+def _qgram_mask(name: str) -> int:
+    """
+    256-bit Bloom signature of the padded bigrams of a name's words.
+    
+    _is_name_match only accepts names sharing at least one whole word, and
+    shared words set identical bits, so ``_qgram_mask(a) & _qgram_mask(b) == 0``
+    proves the names can't match.
+    """
+    mask = 0
+    for word in _name_words(name)[0]:
+        padded = f" {word} "
+        for i in range(len(padded) - 1):
+            mask |= 1 << (hash(padded[i:i + 2]) & 255)
+    return mask
+
+
+# Reporting owners precede the transaction tables, so reading can stop at these
+_OWNER_SECTION_END_MARKERS = (b'<nonderivativetable', b'<derivativetable', b'</ownershipdocument')
+
+
+class NameTrie:
+    """
+    Character trie mapping normalized owner names to resolved CIK entries.
+    
+    Lookups cost O(len(name)) regardless of how many names are stored.
+    """
+    
+    # Dict key holding a node's entries; can't collide with a character
+    _ENTRIES = None
+    
+    def __init__(self):
+        self._root: Dict[Any, Any] = {}
+    
+    def insert(self, name: str, entry: Dict[str, Any]):
+        """Store an entry under a normalized name."""
+        node = self._root
+        for char in name:
+            node = node.setdefault(char, {})
+        entries = node.setdefault(self._ENTRIES, [])
+        if entry not in entries:
+            entries.append(entry)
+    
+    def _walk(self, name: str) -> Optional[Dict[Any, Any]]:
+        node = self._root
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+    
+    def get(self, name: str) -> List[Dict[str, Any]]:
+        """Return entries stored under exactly this normalized name."""
+        node = self._walk(name)
+        return list(node.get(self._ENTRIES, [])) if node else []
+
+
+class CIKStore:
+    """
+    SQLite-backed store of resolved people that survives process restarts.
+    
+    Rows are keyed on ``name_key`` of the name, so "Gale Klappa" and
+    "KLAPPA GALE E" share one entry. A person's CIK never changes, hence the
+    long default ttl. When the cache directory can't be written, results are
+    kept in memory for the life of the process instead.
+    """
+    
+    def __init__(self, path: Optional[str] = None, ttl: timedelta = timedelta(days=180)):
+        self.ttl = ttl
+        self._memory: Dict[str, Tuple[Dict[str, Any], datetime]] = {}
+        self.path: Optional[str] = None
+        try:
+            db_path = path or str(get_cache_dir() / 'cik_cache.sqlite3')
+            with closing(sqlite3.connect(db_path)) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS resolved_ciks "
+                    "(name TEXT PRIMARY KEY, result TEXT NOT NULL, expires_at TEXT NOT NULL)"
+                )
+            self.path = db_path
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"CIK store unavailable, keeping resolved CIKs in memory: {e}")
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+    
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the stored result for a name unless it has expired."""
+        if self.path is None:
+            result, expires_at = self._memory.get(name, (None, datetime.min))
+            return result if expires_at > datetime.now() else None
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT result FROM resolved_ciks WHERE name = ? AND expires_at > ?",
+                    (name, datetime.now().isoformat())
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"CIK store read failed: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+    
+    def set(self, name: str, result: Dict[str, Any]):
+        """Store a resolved result for ``ttl``."""
+        if self.path is None:
+            self._memory[name] = (result, datetime.now() + self.ttl)
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO resolved_ciks VALUES (?, ?, ?)",
+                    (name, json.dumps(result), (datetime.now() + self.ttl).isoformat())
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"CIK store write failed: {e}")
+
 
 class PersonCIKResolver:
     """
@@ -22,16 +156,20 @@ class PersonCIKResolver:
     rather than searching by name across multiple variations.
     """
     
-    def __init__(self, user_agent: str):
+    def __init__(self, user_agent: str, session: Optional[requests.Session] = None):
         self.user_agent = user_agent
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
-        self.fulltext_searcher = SECFullTextSearcher(user_agent)
+        # Shared with the full-text searcher, so both reuse the same keep-alive connections
+        self.session = session or get_session()
+        self.headers = {'User-Agent': user_agent}
+        self.fulltext_searcher = SECFullTextSearcher(user_agent, session=self.session)
+        
+        # Resolved CIKs, persisted across restarts
+        self._cik_cache = CIKStore()
         
-        # In-memory cache for resolved CIKs
-        self._cik_cache = {}
+        # Normalized name forms of people resolved by this process; the store
+        # already answers for anyone resolved before a restart
+        self._name_trie = NameTrie()
     
-    @cached(filing_type='person_cik')
     def resolve_person_cik(self, person_name: str) -> Optional[Dict[str, Any]]:
         """
         Resolve a person's name to their CIK and associated metadata.
@@ -46,35 +184,92 @@ class PersonCIKResolver:
                 'confidence': 0.95
             }
         """
-        # Check cache first
-        cache_key = person_name.upper().strip()
-        if cache_key in self._cik_cache:
-            return self._cik_cache[cache_key]
+        # Check the persistent store first; any word order or nickname of the name hits
+        cache_key = name_key(person_name)
+        hit = self._cik_cache.get(cache_key) if cache_key else None
+        if hit:
+            return hit
+        
+        # Any previously seen form of this name ("Gale Klappa", "KLAPPA GALE E");
+        # a name shared by several resolved people is resolved afresh instead
+        known = self._name_trie.get(name_matcher.normalize_name(person_name))
+        if len(known) == 1:
+            return known[0]
         
         logger.info(f"Attempting to resolve CIK for: {person_name}")
         
         # Try multiple methods to find the CIK
         result = None
         
-        # Method 1: Extract from recent Form 4 filings
-        result = self._extract_cik_from_form4s(person_name)
+        # Method 1: Look the name up in the local index of this quarter's Form 4 filers
+        result = self._lookup_bulk_index(person_name)
+        
+        # Method 2: Extract from recent Form 4 filings
+        if not result:
+            result = self._extract_cik_from_form4s(person_name)
         
-        # Method 2: Use SEC's entity search (if available)
+        # Method 3: Use SEC's entity search (if available)
         if not result:
             result = self._search_sec_entities(person_name)
         
-        # Method 3: Parse from known filing URLs
+        # Method 4: Parse from known filing URLs
         if not result:
             result = self._extract_from_filing_urls(person_name)
         
         if result:
-            self._cik_cache[cache_key] = result
+            if cache_key:
+                self._cik_cache.set(cache_key, result)
+            self._index_names(person_name, result)
             logger.info(f"Successfully resolved CIK for {person_name}: {result['cik']}")
         else:
             logger.warning(f"Could not resolve CIK for {person_name}")
         
         return result
     
+    def _index_names(self, person_name: str, result: Dict[str, Any]):
+        """Add "first last" and "last first" forms of each known name to the trie."""
+        for name in [person_name, *result.get('name_variations', [])]:
+            words = name_matcher.normalize_name(name).split()
+            if not words:
+                continue
+            forms = {' '.join(words)}
+            if len(words) >= 2:
+                # SEC lists owners as "LAST FIRST MIDDLE"; rotate either way
+                forms.add(' '.join(words[1:] + words[:1]))
+                forms.add(' '.join(words[-1:] + words[:-1]))
+            for form in forms:
+                self._name_trie.insert(form, result)
+    
+    def _lookup_bulk_index(self, person_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a name from the bulk form index, refreshed weekly, without per-filing requests.
+        
+        Building the index downloads a whole quarterly form.gz, so it is only
+        used with SEC_EDGAR_USE_LOCAL_DATA set.
+        """
+        if not use_local_data():
+            return None
+        try:
+            ensure_bulk_index(self.user_agent, max_age_days=7)
+            filers = find_filers_by_name(person_name)
+        except Exception as e:
+            logger.debug(f"Bulk index lookup failed: {e}")
+            return None
+        
+        if not filers:
+            return None
+        
+        best_cik = filers[0]['cik']
+        matches = [f for f in filers if f['cik'] == best_cik]
+        count = sum(f['filing_count'] for f in matches)
+        return {
+            'cik': best_cik,
+            'name': matches[0]['name'],
+            'name_variations': list(dict.fromkeys(f['name'] for f in filers)),
+            'companies': list(dict.fromkeys(t for f in matches for t in f['tickers'])),
+            'confidence': min(0.95, 0.7 + (count * 0.05))
+        }
+    
     def _extract_cik_from_form4s(self, person_name: str) -> Optional[Dict[str, Any]]:
         """Extract CIK from recent Form 4 filings."""
         try:
@@ -88,65 +283,38 @@ class PersonCIKResolver:
             if not recent_filings:
                 return None
             
-            cik_candidates = {}
+            cik_counts: Counter = Counter()
+            cik_names = defaultdict(set)
             name_variations_found = set()
             companies = set()
             
-            for filing in recent_filings:
-                if not filing.get('filing_url'):
-                    continue
-                
-                try:
-                    # Fetch filing content
-                    response = self.session.get(filing['filing_url'])
-                    response.raise_for_status()
-                    content = response.text
-                    
-                    # Extract reporting owner CIK
-                    # Look for patterns like:
-                    # <reportingOwnerId>
-                    #   <rptOwnerCik>0001234567</rptOwnerCik>
-                    #   <rptOwnerName>KLAPPA GALE E</rptOwnerName>
-                    
-                    # Find all reporting owners
-                    owner_pattern = re.compile(
-                        r'<reportingOwnerId>.*?<rptOwnerCik>(\d{10})</rptOwnerCik>.*?<rptOwnerName>([^<]+)</rptOwnerName>.*?</reportingOwnerId>',
-                        re.DOTALL | re.IGNORECASE
-                    )
-                    
-                    for match in owner_pattern.finditer(content):
-                        cik = match.group(1)
-                        name = match.group(2).strip()
-                        
-                        # Check if this name matches our search
-                        if self._is_name_match(person_name, name):
-                            if cik not in cik_candidates:
-                                cik_candidates[cik] = {
-                                    'count': 0,
-                                    'names': set()
-                                }
-                            cik_candidates[cik]['count'] += 1
-                            cik_candidates[cik]['names'].add(name)
-                            name_variations_found.add(name)
-                            
-                            # Track companies
-                            if filing.get('ticker'):
-                                companies.add(filing['ticker'])
+            # Fetch filings concurrently; the shared rate limiter paces requests
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                owners_per_filing = list(executor.map(
+                    lambda filing: self._parse_one_filing(person_name, filing),
+                    recent_filings
+                ))
+            
+            for owners in owners_per_filing:
+                for cik, name, ticker in owners:
+                    cik_counts[cik] += 1
+                    cik_names[cik].add(name)
+                    name_variations_found.add(name)
                     
-                except Exception as e:
-                    logger.debug(f"Error parsing filing: {e}")
-                    continue
+                    # Track companies
+                    if ticker:
+                        companies.add(ticker)
             
             # Select the most common CIK
-            if cik_candidates:
-                best_cik = max(cik_candidates.items(), key=lambda x: x[1]['count'])
+            if cik_counts:
+                best_cik, count = cik_counts.most_common(1)[0]
                 
                 return {
-                    'cik': best_cik[0],
-                    'name': list(best_cik[1]['names'])[0],  # Use most common name form
+                    'cik': best_cik,
+                    'name': next(iter(cik_names[best_cik])),  # Use most common name form
                     'name_variations': list(name_variations_found),
                     'companies': list(companies),
-                    'confidence': min(0.95, 0.7 + (best_cik[1]['count'] * 0.05))  # Higher count = higher confidence
+                    'confidence': min(0.95, 0.7 + (count * 0.05))  # Higher count = higher confidence
                 }
         
         except Exception as e:
@@ -154,6 +322,64 @@ class PersonCIKResolver:
         
         return None
     
+    @rate_limited
+    def _parse_one_filing(self, person_name: str, filing: FilingHit) -> List[tuple]:
+        """Return (cik, name, ticker) for each reporting owner matching the person."""
+        try:
+            # Only the owner section near the top of the filing is needed
+            owners = self._read_reporting_owners(filing.filing_url)
+        except Exception as e:
+            logger.debug(f"Error parsing filing: {e}")
+            return []
+        
+        # Keep owners whose name matches our search; the Bloom signatures
+        # rule out unrelated owners before the full comparison
+        search_mask = _qgram_mask(person_name)
+        return [
+            (cik, name, filing.ticker)
+            for cik, name in owners
+            if search_mask & _qgram_mask(name) and self._is_name_match(person_name, name)
+        ]
+    
+    def _read_reporting_owners(self, url: str, chunk_size: int = 8192) -> List[tuple]:
+        """
+        Stream a filing and return (cik, name) for each reporting owner.
+        
+        The embedded ownershipDocument XML is fed to an incremental lxml parser
+        as raw bytes as they arrive, leaving the decoding to libxml2, and
+        reading stops once the owner section has ended.
+        """
+        parser = etree.XMLPullParser(events=('end',), tag='{*}reportingOwnerId', recover=True)
+        owners = []
+        pending = b''  # SGML wrapper bytes before the XML document starts
+        tail = b''
+        
+        with self.session.get(url, headers=self.headers, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if pending is not None:
+                    pending += chunk
+                    start = pending.find(b'<ownershipDocument')
+                    if start < 0:
+                        continue
+                    chunk, pending = pending[start:], None
+                
+                parser.feed(chunk)
+                for _, elem in parser.read_events():
+                    cik = (elem.findtext('{*}rptOwnerCik') or '').strip()
+                    name = (elem.findtext('{*}rptOwnerName') or '').strip()
+                    if cik.isdigit() and name:
+                        owners.append((cik.zfill(10), name))
+                    elem.clear()
+                
+                # Keep a little of the previous chunk so split markers are still seen
+                window = (tail + chunk).lower()
+                if any(marker in window for marker in _OWNER_SECTION_END_MARKERS):
+                    break
+                tail = chunk[-32:]
+        
+        return owners
+    
     def _search_sec_entities(self, person_name: str) -> Optional[Dict[str, Any]]:
         """
         Search SEC's entity database for the person.
@@ -183,13 +409,9 @@ class PersonCIKResolver:
             "Gale Klappa" matches "KLAPPA GALE E"
             "John Smith" matches "Smith, John"
         """
-        # Normalize names
-        search_clean = re.sub(r'[^\w\s]', '', search_name.upper()).split()
-        found_clean = re.sub(r'[^\w\s]', '', found_name.upper()).split()
-        
-        # Check if all parts of search name are in found name
-        search_set = set(search_clean)
-        found_set = set(found_clean)
+        # Normalize names; the same candidates recur across searches, so this is cached
+        search_clean, search_set = _name_words(search_name)
+        found_clean, found_set = _name_words(found_name)
         
         # If all search parts are in found parts, it's a match
         if search_set.issubset(found_set):
@@ -204,7 +426,6 @@ class PersonCIKResolver:
         
         return False
     
-    @rate_limited
     def search_by_cik(self, cik: str, form_type: str = "4") -> List[Dict[str, Any]]:
         """
         Search for all filings by a specific CIK.
@@ -212,13 +433,8 @@ class PersonCIKResolver:
         This is more efficient than searching by name.
         """
         try:
-            # SEC submissions endpoint for a specific CIK
-            url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-            
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            data = response.json()
+            # Local bulk archive when enabled, else the submissions API (rate limited, revalidated)
+            data = json.loads(load_submissions(cik, self.user_agent, session=self.session))
             
             # Extract recent filings
             recent_filings = []
@@ -230,17 +446,19 @@ class PersonCIKResolver:
                 accessions = filings.get('accessionNumber', [])
                 primary_docs = filings.get('primaryDocument', [])
                 
-                for i in range(len(forms)):
-                    if forms[i] == form_type:
-                        recent_filings.append({
-                            'form_type': forms[i],
-                            'filing_date': dates[i] if i < len(dates) else None,
-                            'accession_number': accessions[i] if i < len(accessions) else None,
-                            'document': primary_docs[i] if i < len(primary_docs) else None,
-                            'cik': cik
-                        })
+                # Pick the matching rows (most recent 100) before building any dicts
+                rows = [i for i, form in enumerate(forms) if form == form_type][:100]
+                
+                for i in rows:
+                    recent_filings.append({
+                        'form_type': forms[i],
+                        'filing_date': dates[i] if i < len(dates) else None,
+                        'accession_number': accessions[i] if i < len(accessions) else None,
+                        'document': primary_docs[i] if i < len(primary_docs) else None,
+                        'cik': cik
+                    })
             
-            return recent_filings[:100]  # Limit to most recent 100
+            return recent_filings
             
         except Exception as e:
             logger.error(f"Error searching by CIK {cik}: {e}")
@@ -3,18 +3,127 @@
 import logging
 import re
 import requests
-from typing import List, Dict, Any, Optional, Set
+from bisect import bisect_left
+from typing import Iterable, List, Dict, Any, Optional, Set
 from datetime import date, datetime, timedelta
 from dataclasses import dataclass
 import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 from secedgar import filings, FilingType
 
+from .http_cache import FileCache
+from .http_client import get_secedgar_client, get_session
 from .models import BoardPosition, PositionType, PositionStatus
 from .utils import rate_limited, cached, normalize_ticker, parse_date
 
 logger = logging.getLogger(__name__)
 
+# Proxy statements larger than this are not worth holding in memory to parse
+MAX_PROXY_BYTES = 30_000_000
+
+# Decoded proxy statements, keyed by URL
+_proxy_cache = FileCache('proxy')
+
+# Parse bytes with an explicit encoding; lxml rejects str input that carries an XML declaration
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+_PAGE_RE = re.compile(r'Page \d+')
+# Characters ignored when comparing board member names
+_DEDUP_TABLE = str.maketrans('', '', '.,')
+_TRAILING_NUMBER_RE = re.compile(r'\d+\s*$', re.MULTILINE)
+
+# Common section headers for board information, in order of preference. Wrapped in a
+# lookahead so a heading that starts inside another one (e.g. "board of directors and
+# executive officers") is still seen.
+_SECTION_RE = re.compile(
+    r'(?=(?P<officers>directors?\s+and\s+executive\s+officers?)'
+    r'|(?P<board>board\s+of\s+directors?)'
+    r'|(?P<nominees>director\s+nominees?)'
+    r'|(?P<continuing>continuing\s+directors?)'
+    r'|(?P<management>management\s+and\s+directors?))',
+    re.IGNORECASE
+)
+_SECTION_END_RE = re.compile(r'(compensation|audit|governance|proposal)', re.IGNORECASE)
+# Searched case-insensitively in place, so a large filing is never copied just to lowercase it
+_DIRECTOR_WORD_RE = re.compile(r'director', re.IGNORECASE)
+
+# Look for patterns like "Name, Age X" or "Name (Age X)". The name run is possessive so
+# long stretches of capitalized words can't backtrack; trailing initials are trimmed
+# afterwards by _TRAILING_INITIALS_RE.
+_DIRECTOR_RE = re.compile(
+    r'([A-Z][a-z]++(?:\s++[A-Z][a-z]*+\.?)++)(?:,?\s*+\(?(?:Age\s*+)?(\d{2,3})(?!\d)\)?)?'
+)
+_TRAILING_INITIALS_RE = re.compile(r'\.?(?:\s+[A-Z]\.?)*$')
+
+# The patterns below fuse each category into one alternation of named groups so the
+# context is scanned once. Where categories compete, group order is the priority
+# (see _first_by_priority).
+
+_POSITION_RE = re.compile(
+    r'(?P<executive>chairman|chair|president|ceo|chief executive|cfo|chief financial|coo|chief operating)'
+    r'|(?P<director>director|independent director|lead director|board member)'
+    r'|(?P<vice>vice chairman|vice president|executive vice president)',
+    re.IGNORECASE
+)
+
+_COMMITTEE_RE = re.compile(
+    r'(?P<audit>audit\s+committee)|(?P<compensation>compensation\s+committee)'
+    r'|(?P<nominating>nominating\s+committee)|(?P<governance>governance\s+committee)'
+    r'|(?P<risk>risk\s+committee)|(?P<executive>executive\s+committee)|(?P<finance>finance\s+committee)',
+    re.IGNORECASE
+)
+
+# Tenure patterns like "Director since 2018" or "10 years"; each group holds the number
+_TENURE_RE = re.compile(
+    r'(?:director\s+)?since\s+(?P<since>\d{4})'
+    r'|(?P<years>\d{1,2})\s+years?\s+(?:of\s+)?(?:service|tenure)'
+    r'|appointed\s+(?:in\s+)?(?P<appointed>\d{4})',
+    re.IGNORECASE
+)
+
+_COMP_RE = re.compile(r'\$(\d[\d,]*(?:\.\d{2})?)')
+_INDEPENDENCE_RE = re.compile(
+    r'(?P<independent>independent\s+director)|(?P<employee>employee|officer|management)',
+    re.IGNORECASE
+)
+
+# Group names are PositionType members
+_POSITION_TYPE_RE = re.compile(
+    r'(?P<VICE_CHAIRMAN>vice\W*chairman)|(?P<CHAIRMAN>chairman)'
+    r'|(?P<CEO>ceo|chief executive)|(?P<CFO>cfo|chief financial)|(?P<COO>coo|chief operating)'
+    r'|(?P<PRESIDENT>president)|(?P<LEAD_DIRECTOR>lead director)'
+    r'|(?P<INDEPENDENT_DIRECTOR>independent director)|(?P<DIRECTOR>director)'
+)
+
+
+def _first_by_priority(matches: Iterable[re.Match]) -> Optional[re.Match]:
+    """Return the earliest match of the highest-priority (lowest numbered) group that matched."""
+    best = None
+    best_index = 0
+    for match in matches:
+        index = match.lastindex
+        # Matches outside every group carry no priority
+        if index is None:
+            continue
+        if best is None or index < best_index:
+            best, best_index = match, index
+            if index == 1:
+                break
+    return best
+
+
+class _MatchIndex:
+    """All matches of one pattern over a text, retrievable by position window."""
+    
+    def __init__(self, pattern: re.Pattern, text: str):
+        self.matches = list(pattern.finditer(text))
+        self.starts = [match.start() for match in self.matches]
+    
+    def within(self, start: int, end: int) -> List[re.Match]:
+        """Matches lying entirely inside text[start:end], in order."""
+        lo = bisect_left(self.starts, start)
+        hi = bisect_left(self.starts, end, lo)
+        return [match for match in self.matches[lo:hi] if match.end() <= end]
+
 
 @dataclass
 class ProxyBoardMember:
@@ -33,17 +142,37 @@ class ProxyBoardMember:
 class ProxyStatementParser:
     """Parser for DEF 14A proxy statements to extract current board information."""
     
-    def __init__(self, user_agent: str):
+    def __init__(self, user_agent: str, session: Optional[requests.Session] = None):
         self.user_agent = user_agent
+        self.session = session or get_session()
+        self.headers = {'User-Agent': user_agent}
         
-    @rate_limited
     def fetch_filing_content(self, url: str) -> Optional[str]:
-        """Fetch content from SEC filing URL."""
+        """Fetch content from SEC filing URL, using the on-disk copy when there is one."""
+        cached_content = _proxy_cache.get(url)
+        if cached_content is not None:
+            return cached_content.decode('utf-8')
+        
+        content = self._download(url)
+        if content is not None:
+            _proxy_cache.set(url, content.encode('utf-8'))
+        return content
+    
+    @rate_limited
+    def _download(self, url: str) -> Optional[str]:
+        """Download and decode a filing, giving up past MAX_PROXY_BYTES."""
         try:
-            headers = {'User-Agent': self.user_agent}
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.text
+            with self.session.get(url, headers=self.headers, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                chunks = []
+                total = 0
+                for chunk in response.iter_content(chunk_size=65536):
+                    total += len(chunk)
+                    if total > MAX_PROXY_BYTES:
+                        logger.warning(f"Skipping filing larger than {MAX_PROXY_BYTES} bytes: {url}")
+                        return None
+                    chunks.append(chunk)
+                return b''.join(chunks).decode(response.encoding or 'utf-8', errors='replace')
         except Exception as e:
             logger.error(f"Error fetching filing from {url}: {e}")
             return None
@@ -59,6 +188,11 @@ class ProxyStatementParser:
         if not content:
             return []
         
+        # Every board section heading mentions directors; skip cleaning documents that never do
+        if not _DIRECTOR_WORD_RE.search(content):
+            logger.warning(f"No board section in proxy statement for {company_name} ({ticker})")
+            return []
+        
         logger.info(f"Parsing proxy statement for {company_name} ({ticker})")
         
         try:
@@ -104,15 +238,14 @@ class ProxyStatementParser:
         """Clean proxy statement content for easier parsing."""
         # Remove HTML tags if present
         if '<' in content and '>' in content:
-            soup = BeautifulSoup(content, 'html.parser')
-            content = soup.get_text()
+            content = lxml_html.fromstring(content.encode('utf-8'), parser=_HTML_PARSER).text_content()
         
         # Remove excessive whitespace
-        content = re.sub(r'\s+', ' ', content)
+        content = ' '.join(content.split())
         
         # Remove page numbers and headers/footers
-        content = re.sub(r'Page \d+', '', content)
-        content = re.sub(r'\d+\s*$', '', content, flags=re.MULTILINE)
+        content = _PAGE_RE.sub('', content)
+        content = _TRAILING_NUMBER_RE.sub('', content)
         
         return content
     
@@ -120,46 +253,38 @@ class ProxyStatementParser:
         """Extract board member information from proxy statement content."""
         board_members = []
         
-        # Common section headers for board information
-        board_sections = [
-            r'(?i)directors?\s+and\s+executive\s+officers?',
-            r'(?i)board\s+of\s+directors?',
-            r'(?i)director\s+nominees?',
-            r'(?i)continuing\s+directors?',
-            r'(?i)management\s+and\s+directors?'
-        ]
-        
         # Find board section
         board_content = None
-        for pattern in board_sections:
-            match = re.search(pattern, content)
-            if match:
-                start_pos = match.start()
-                # Find end of section (next major heading or end of document)
-                end_match = re.search(r'(?i)(compensation|audit|governance|proposal)', content[start_pos + 100:])
-                if end_match:
-                    end_pos = start_pos + 100 + end_match.start()
-                    board_content = content[start_pos:end_pos]
-                else:
-                    board_content = content[start_pos:start_pos + 10000]  # Take next 10k chars
-                break
+        match = _first_by_priority(_SECTION_RE.finditer(content))
+        if match:
+            start_pos = match.start()
+            # Find end of section (next major heading or end of document)
+            end_match = _SECTION_END_RE.search(content, start_pos + 100)
+            if end_match:
+                board_content = content[start_pos:end_match.start()]
+            else:
+                board_content = content[start_pos:start_pos + 10000]  # Take next 10k chars
         
         if not board_content:
             logger.warning("Could not find board section in proxy statement")
             return board_members
         
-        # Extract individual director information
-        # Look for patterns like "Name, Age X" or "Name (Age X)"
-        director_pattern = r'([A-Z][a-z]+(?:\s+[A-Z][a-z]*\.?)*(?:\s+[A-Z][a-z]+)+)(?:,?\s*(?:Age\s*)?(?:\(?)?\d{2,3}(?:\)?)?)?'
+        # Scan the section once per category; each director then only looks up its window
+        positions = _MatchIndex(_POSITION_RE, board_content)
+        committee_mentions = _MatchIndex(_COMMITTEE_RE, board_content)
+        tenures = _MatchIndex(_TENURE_RE, board_content)
+        amounts = _MatchIndex(_COMP_RE, board_content)
+        independence = _MatchIndex(_INDEPENDENCE_RE, board_content)
         
-        potential_directors = re.finditer(director_pattern, board_content)
+        # Extract individual director information
+        potential_directors = _DIRECTOR_RE.finditer(board_content)
         
         for match in potential_directors:
-            name = match.group(1).strip()
+            name = _TRAILING_INITIALS_RE.sub('', match.group(1), count=1)
             age = int(match.group(2)) if match.group(2) else None
             
             # Skip if name is too short or contains common non-name words
-            if len(name) < 6 or any(word in name.lower() for word in ['committee', 'board', 'director', 'officer']):
+            if len(name) < 6 or ' ' not in name or any(word in name.lower() for word in ['committee', 'board', 'director', 'officer']):
                 continue
             
             # Extract additional information around this name
@@ -168,16 +293,16 @@ class ProxyStatementParser:
             context = board_content[start_pos:end_pos]
             
             # Extract position information
-            position = self._extract_position_info(context, name)
+            position = self._extract_position_info(positions.within(start_pos, end_pos), name)
             
             # Extract committee memberships
-            committees = self._extract_committees(context)
+            committees = self._extract_committees(committee_mentions.within(start_pos, end_pos))
             
             # Extract tenure/appointment date
-            appointment_date, tenure_years = self._extract_tenure_info(context)
+            appointment_date, tenure_years = self._extract_tenure_info(tenures.within(start_pos, end_pos))
             
             # Extract compensation if available
-            compensation = self._extract_compensation(context)
+            compensation = self._extract_compensation(amounts.within(start_pos, end_pos))
             
             member = ProxyBoardMember(
                 name=name,
@@ -187,7 +312,7 @@ class ProxyStatementParser:
                 appointment_date=appointment_date,
                 committees=committees,
                 compensation=compensation,
-                independence=self._determine_independence(context),
+                independence=self._determine_independence(independence.within(start_pos, end_pos)),
                 other_directorships=self._extract_other_directorships(context)
             )
             
@@ -198,88 +323,48 @@ class ProxyStatementParser:
         
         return board_members
     
-    def _extract_position_info(self, context: str, name: str) -> str:
-        """Extract position/title information for a board member."""
+    def _extract_position_info(self, matches: List[re.Match], name: str) -> str:
+        """Extract position/title information for a board member from nearby position matches."""
         # Look for position titles near the name
-        position_patterns = [
-            r'(?i)(chairman|chair|president|ceo|chief executive|cfo|chief financial|coo|chief operating)',
-            r'(?i)(director|independent director|lead director|board member)',
-            r'(?i)(vice chairman|vice president|executive vice president)'
-        ]
-        
-        for pattern in position_patterns:
-            match = re.search(pattern, context)
-            if match:
-                return match.group(1).title()
+        match = _first_by_priority(matches)
+        if match:
+            return match.group().title()
         
         return "Director"  # Default position
     
-    def _extract_committees(self, context: str) -> List[str]:
-        """Extract committee memberships from context."""
-        committees = []
-        
-        committee_patterns = [
-            r'(?i)(audit\s+committee)',
-            r'(?i)(compensation\s+committee)',
-            r'(?i)(nominating\s+committee)',
-            r'(?i)(governance\s+committee)',
-            r'(?i)(risk\s+committee)',
-            r'(?i)(executive\s+committee)',
-            r'(?i)(finance\s+committee)'
-        ]
-        
-        for pattern in committee_patterns:
-            match = re.search(pattern, context)
-            if match:
-                committees.append(match.group(1).title())
-        
-        return list(set(committees))  # Remove duplicates
+    def _extract_committees(self, matches: List[re.Match]) -> List[str]:
+        """Extract committee memberships from nearby committee matches."""
+        committees = {match.lastgroup: match.group().title() for match in matches}
+        return list(committees.values())
     
-    def _extract_tenure_info(self, context: str) -> tuple[Optional[date], Optional[int]]:
+    def _extract_tenure_info(self, matches: List[re.Match]) -> tuple[Optional[date], Optional[int]]:
         """Extract tenure information and calculate appointment date."""
-        # Look for tenure patterns like "Director since 2018" or "10 years"
-        tenure_patterns = [
-            r'(?i)(?:director\s+)?since\s+(\d{4})',
-            r'(?i)(\d{1,2})\s+years?\s+(?:of\s+)?(?:service|tenure)',
-            r'(?i)appointed\s+(?:in\s+)?(\d{4})'
-        ]
-        
-        for pattern in tenure_patterns:
-            match = re.search(pattern, context)
-            if match:
-                value = match.group(1)
-                if len(value) == 4:  # Year format
-                    year = int(value)
-                    appointment_date = date(year, 1, 1)  # Approximate to beginning of year
-                    tenure_years = date.today().year - year
-                    return appointment_date, tenure_years
-                else:  # Years format
-                    tenure_years = int(value)
-                    appointment_year = date.today().year - tenure_years
-                    appointment_date = date(appointment_year, 1, 1)
-                    return appointment_date, tenure_years
+        match = _first_by_priority(matches)
+        if match:
+            value = match.group(match.lastgroup)
+            if len(value) == 4:  # Year format
+                year = int(value)
+                appointment_date = date(year, 1, 1)  # Approximate to beginning of year
+                tenure_years = date.today().year - year
+                return appointment_date, tenure_years
+            else:  # Years format
+                tenure_years = int(value)
+                appointment_year = date.today().year - tenure_years
+                appointment_date = date(appointment_year, 1, 1)
+                return appointment_date, tenure_years
         
         return None, None
     
-    def _extract_compensation(self, context: str) -> Optional[float]:
-        """Extract compensation information if available."""
-        # Look for dollar amounts that might be compensation
-        compensation_pattern = r'\$([\\d,]+(?:\\.\\d{2})?)'
-        
-        matches = re.findall(compensation_pattern, context)
-        if matches:
-            # Take the largest amount found (likely total compensation)
-            amounts = [float(m.replace(',', '')) for m in matches]
-            return max(amounts)
-        
-        return None
+    def _extract_compensation(self, matches: List[re.Match]) -> Optional[float]:
+        """Extract compensation information from nearby dollar amounts, if any."""
+        # Take the largest amount found (likely total compensation)
+        return max((float(m.group(1).replace(',', '')) for m in matches), default=None)
     
-    def _determine_independence(self, context: str) -> Optional[bool]:
-        """Determine if director is independent based on context."""
-        if re.search(r'(?i)independent\s+director', context):
-            return True
-        elif re.search(r'(?i)(?:employee|officer|management)', context):
-            return False
+    def _determine_independence(self, matches: List[re.Match]) -> Optional[bool]:
+        """Determine if director is independent based on nearby independence signals."""
+        match = _first_by_priority(matches)
+        if match:
+            return match.lastgroup == 'independent'
         return None
     
     def _extract_other_directorships(self, context: str) -> List[str]:
@@ -290,43 +375,21 @@ class ProxyStatementParser:
     
     def _classify_position_type(self, position: str) -> PositionType:
         """Classify position string into PositionType enum."""
-        position_lower = position.lower()
-        
-        if 'chairman' in position_lower:
-            if 'vice' in position_lower:
-                return PositionType.VICE_CHAIRMAN
-            return PositionType.CHAIRMAN
-        elif 'ceo' in position_lower or 'chief executive' in position_lower:
-            return PositionType.CEO
-        elif 'cfo' in position_lower or 'chief financial' in position_lower:
-            return PositionType.CFO
-        elif 'coo' in position_lower or 'chief operating' in position_lower:
-            return PositionType.COO
-        elif 'president' in position_lower:
-            return PositionType.PRESIDENT
-        elif 'lead director' in position_lower:
-            return PositionType.LEAD_DIRECTOR
-        elif 'independent director' in position_lower:
-            return PositionType.INDEPENDENT_DIRECTOR
-        elif 'director' in position_lower:
-            return PositionType.DIRECTOR
-        else:
+        match = _first_by_priority(_POSITION_TYPE_RE.finditer(position.lower()))
+        if not match or match.lastgroup is None:
             return PositionType.UNKNOWN
+        return PositionType[match.lastgroup]
     
     def _deduplicate_board_members(self, members: List[ProxyBoardMember]) -> List[ProxyBoardMember]:
         """Remove duplicate board members based on name similarity."""
-        unique_members = []
-        seen_names = set()
+        unique_members: Dict[str, ProxyBoardMember] = {}
         
         for member in members:
-            # Normalize name for comparison
-            normalized_name = member.name.lower().replace('.', '').replace(',', '').strip()
-            
-            if normalized_name not in seen_names:
-                unique_members.append(member)
-                seen_names.add(normalized_name)
+            # Normalize name for comparison; the first member seen under a name wins
+            normalized_name = member.name.casefold().translate(_DEDUP_TABLE).strip()
+            unique_members.setdefault(normalized_name, member)
         
-        return unique_members
+        return list(unique_members.values())
 
 
 @cached(filing_type='proxy')
@@ -344,7 +407,7 @@ def get_current_board_from_proxy(company: str, user_agent: str) -> List[BoardPos
         company_filings = filings(
             cik_lookup=company,
             filing_type=FilingType.DEF14A,  # Proxy statements
-            user_agent=user_agent,
+            client=get_secedgar_client(user_agent),
             start_date=start_date,
             end_date=end_date
         )
@@ -353,7 +416,7 @@ def get_current_board_from_proxy(company: str, user_agent: str) -> List[BoardPos
         urls_dict = company_filings.get_urls()
         
         if isinstance(urls_dict, dict):
-            company_key = list(urls_dict.keys())[0] if urls_dict else None
+            company_key = next(iter(urls_dict), None)
             filing_urls = urls_dict.get(company_key, []) if company_key else []
         else:
             filing_urls = list(urls_dict) if urls_dict else []
@@ -3,19 +3,52 @@
 import logging
 import requests
 import re
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import date, datetime, timedelta
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from urllib.parse import quote_plus
 from bs4 import BeautifulSoup
 import json
 
+from .bulk import ensure_bulk_index, find_filings_by_person, indexed_since
+from .config import use_local_data
+from .http_cache import FileCache
+from .http_client import FETCH_WORKERS, get_session
 from .utils import rate_limited, cached
 from .models import Filing
 from .name_matching import name_matcher
 
 logger = logging.getLogger(__name__)
 
+# SEC often includes the ticker in parentheses: "Company Name (TICK)"
+_TICKER_RE = re.compile(r'\(([A-Z]{1,5})\)$')
+# Accession numbers appear without dashes in archive directory names
+_DASH_TABLE = str.maketrans('', '', '-')
+# Form 4 XML tags the owner CIK as <rptOwnerCik>; <reportingOwnerCik> is kept for older documents.
+# Matched on raw bytes so multi-megabyte filings are never decoded.
+_REPORTING_OWNER_CIK_RE = re.compile(rb'<(?:rptOwnerCik|reportingOwnerCik)>\s*(\d{10})\s*<')
+
+# Raw Form 4 filings fetched while looking up CIKs, keyed by URL
+_filing_cache = FileCache('form4')
+
+
+@dataclass(slots=True)
+class FilingHit:
+    """A single filing returned by SEC full-text search."""
+    accession_number: Optional[str]
+    filing_date: Optional[str]
+    form_type: Optional[str]
+    company_name: Optional[str]
+    cik: Optional[str]
+    ticker: Optional[str]
+    filing_url: str
+    reporting_owner: str  # The name we searched for
+    score: float
+
 
 class SECFullTextSearcher:
     """
@@ -26,19 +59,19 @@ class SECFullTextSearcher:
     BASE_URL = "https://www.sec.gov/edgar/search/"
     API_URL = "https://www.sec.gov/edgar/search-index"
     
-    def __init__(self, user_agent: str):
+    def __init__(self, user_agent: str, session: Optional[requests.Session] = None):
         self.user_agent = user_agent
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
+        # The shared session's pool has a connection for every fetch thread, across searchers
+        self.session = session or get_session()
+        self.headers = {'User-Agent': user_agent}
     
-    @rate_limited
     def search_form4_by_person(
         self, 
         person_name: str,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         limit: int = 200
-    ) -> List[Dict[str, Any]]:
+    ) -> List[FilingHit]:
         """
         Search for all Form 4 filings by a specific person across all companies.
         
@@ -56,38 +89,91 @@ class SECFullTextSearcher:
         if not end_date:
             end_date = date.today()
         
+        if use_local_data():
+            local_results = self._search_local_index(person_name, start_date, end_date, limit)
+            if local_results is not None:
+                return local_results
+        
         # Generate name variations for better matching
         name_variations = generate_name_variations(person_name)
         
-        all_results = []
-        seen_accession_numbers = set()
-        
-        for name_variant in name_variations[:3]:  # Try top 3 variations
+        def search_variant(name_variant: str) -> List[FilingHit]:
             try:
-                results = self._perform_search(
+                return self._perform_search(
                     query=name_variant,
                     form_type="4",
                     start_date=start_date,
                     end_date=end_date,
                     limit=limit
                 )
-                
+            except Exception as e:
+                logger.error(f"Error searching for name variant '{name_variant}': {e}")
+                return []
+        
+        all_results = []
+        seen_accession_numbers = set()
+        
+        # Try top 3 variations concurrently; each request still passes the rate limiter
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for results in executor.map(search_variant, name_variations[:3]):
                 # Deduplicate results
                 for result in results:
-                    accession = result.get('accession_number')
+                    accession = result.accession_number
                     if accession and accession not in seen_accession_numbers:
                         seen_accession_numbers.add(accession)
                         all_results.append(result)
-                
-            except Exception as e:
-                logger.error(f"Error searching for name variant '{name_variant}': {e}")
-                continue
         
         # Sort by date (most recent first)
-        all_results.sort(key=lambda x: x.get('filing_date', ''), reverse=True)
+        all_results.sort(key=lambda x: x.filing_date or '', reverse=True)
         
         return all_results[:limit]
     
+    def _search_local_index(
+        self,
+        person_name: str,
+        start_date: date,
+        end_date: date,
+        limit: int
+    ) -> Optional[List[FilingHit]]:
+        """
+        Answer a search from the local form index, or None when it can't.
+        
+        The index holds the current quarter, so older windows still go to
+        full-text search, as do names it has no filings for.
+        """
+        try:
+            ensure_bulk_index(self.user_agent)
+            since = indexed_since()
+            if since is None or start_date < since:
+                return None
+            rows = find_filings_by_person(
+                person_name, since=start_date.isoformat(), until=end_date.isoformat(), limit=limit
+            )
+        except Exception as e:
+            logger.debug(f"Local index search failed, using full-text search: {e}")
+            return None
+        
+        if not rows:
+            return None
+        
+        results = []
+        for row in rows:
+            # edgar/data/<filer cik>/<accession>.txt, as listed in the index
+            file_name = row['file_name']
+            results.append(FilingHit(
+                accession_number=file_name.rsplit('/', 1)[-1].removesuffix('.txt'),
+                filing_date=row['date_filed'],
+                form_type=row['form_type'],
+                company_name=row['issuer_name'],
+                cik=row['issuer_cik'],
+                ticker=row['ticker'],
+                filing_url=f"https://www.sec.gov/Archives/{file_name}",
+                reporting_owner=person_name,
+                score=1.0
+            ))
+        return results
+    
+    @rate_limited
     def _perform_search(
         self,
         query: str,
@@ -95,7 +181,7 @@ class SECFullTextSearcher:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         limit: int = 100
-    ) -> List[Dict[str, Any]]:
+    ) -> List[FilingHit]:
         """
         Perform the actual search using SEC's search API.
         
@@ -119,13 +205,15 @@ class SECFullTextSearcher:
                 self.API_URL,
                 json=params,
                 headers={
+                    **self.headers,
                     'Content-Type': 'application/json',
                     'Accept': 'application/json'
                 }
             )
             response.raise_for_status()
             
-            data = response.json()
+            # Decode straight from bytes; skips building response.text first
+            data = json.loads(response.content)
             
             # Extract results
             results = []
@@ -133,21 +221,22 @@ class SECFullTextSearcher:
             
             for hit in hits:
                 source = hit.get('_source', {})
+                adsh = source.get('adsh') or ''
+                cik = (source.get('ciks') or (None,))[0]
+                entity = source.get('entity')
                 
                 # Extract company and filing info
-                result = {
-                    'accession_number': source.get('adsh'),
-                    'filing_date': source.get('file_date'),
-                    'form_type': source.get('form'),
-                    'company_name': source.get('entity'),
-                    'cik': source.get('ciks', [None])[0] if source.get('ciks') else None,
-                    'ticker': self._extract_ticker_from_entity(source.get('entity', '')),
-                    'filing_url': f"https://www.sec.gov/Archives/edgar/data/{source.get('ciks', [None])[0]}/{source.get('adsh', '').replace('-', '')}/{source.get('adsh')}.txt",
-                    'reporting_owner': query,  # We searched for this person
-                    'score': hit.get('_score', 0)
-                }
-                
-                results.append(result)
+                results.append(FilingHit(
+                    accession_number=adsh or None,
+                    filing_date=source.get('file_date'),
+                    form_type=source.get('form'),
+                    company_name=entity,
+                    cik=cik,
+                    ticker=self._extract_ticker_from_entity(entity or ''),
+                    filing_url=f"https://www.sec.gov/Archives/edgar/data/{cik}/{adsh.translate(_DASH_TABLE)}/{adsh}.txt",
+                    reporting_owner=query,  # We searched for this person
+                    score=hit.get('_score', 0)
+                ))
             
             return results
             
@@ -163,7 +252,7 @@ class SECFullTextSearcher:
         Extract ticker symbol from entity string.
         SEC often includes ticker in parentheses: "Company Name (TICK)"
         """
-        match = re.search(r'\(([A-Z]{1,5})\)$', entity_string)
+        match = _TICKER_RE.search(entity_string)
         return match.group(1) if match else None
     
     @cached(filing_type='person_cik_lookup')
@@ -184,30 +273,42 @@ class SECFullTextSearcher:
         if not recent_filings:
             return None
         
-        # Try to extract CIK from filing details
-        for filing in recent_filings:
-            try:
-                # Fetch the filing content
-                response = self.session.get(filing['filing_url'])
-                response.raise_for_status()
-                
+        # Try to extract CIK from filing details. Filings are fetched concurrently
+        # but checked in search order; remaining fetches are cancelled on the first hit.
+        urls = [filing.filing_url for filing in recent_filings]
+        executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        try:
+            for data in executor.map(self._fetch_filing_bytes, urls):
                 # Look for reporting owner CIK in the filing
-                # Pattern: <reportingOwnerCik>0001234567</reportingOwnerCik>
-                cik_match = re.search(
-                    r'<reportingOwnerCik>(\d{10})</reportingOwnerCik>',
-                    response.text,
-                    re.IGNORECASE
-                )
+                # Pattern: <rptOwnerCik>0001234567</rptOwnerCik>
+                cik_match = _REPORTING_OWNER_CIK_RE.search(data) if data else None
                 
                 if cik_match:
-                    return cik_match.group(1)
-                
-            except Exception as e:
-                logger.debug(f"Error extracting CIK from filing: {e}")
-                continue
+                    return cik_match.group(1).decode('ascii')
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
         return None
     
+    def _fetch_filing_bytes(self, url: str) -> Optional[bytes]:
+        """Fetch a filing's raw bytes from disk or SEC, or None if the request fails."""
+        data = _filing_cache.get(url)
+        if data is None:
+            data = self._download_filing(url)
+            if data is not None:
+                _filing_cache.set(url, data)
+        return data
+    
+    @rate_limited
+    def _download_filing(self, url: str) -> Optional[bytes]:
+        try:
+            response = self.session.get(url, headers=self.headers, timeout=30)
+            response.raise_for_status()
+            return response.content
+        except Exception as e:
+            logger.debug(f"Error extracting CIK from filing: {e}")
+            return None
+    
     def get_companies_for_person(self, person_name: str) -> List[Dict[str, Any]]:
         """
         Get a unique list of companies where a person has filed Form 4s.
@@ -222,37 +323,26 @@ class SECFullTextSearcher:
         )
         
         # Group by company
-        companies_map = {}
-        
+        filings_by_company = defaultdict(list)
         for filing in filings:
-            ticker = filing.get('ticker') or filing.get('cik', 'Unknown')
-            company_name = filing.get('company_name', 'Unknown Company')
-            
-            if ticker not in companies_map:
-                companies_map[ticker] = {
-                    'ticker': ticker,
-                    'company_name': company_name,
-                    'cik': filing.get('cik'),
-                    'filing_count': 0,
-                    'first_filing': filing.get('filing_date'),
-                    'last_filing': filing.get('filing_date'),
-                    'filings': []
-                }
-            
-            companies_map[ticker]['filing_count'] += 1
-            companies_map[ticker]['filings'].append(filing)
-            
-            # Update date range
-            filing_date = filing.get('filing_date')
-            if filing_date:
-                if filing_date < companies_map[ticker]['first_filing']:
-                    companies_map[ticker]['first_filing'] = filing_date
-                if filing_date > companies_map[ticker]['last_filing']:
-                    companies_map[ticker]['last_filing'] = filing_date
+            filings_by_company[filing.ticker or filing.cik or 'Unknown'].append(filing)
         
-        # Convert to list and sort by most recent activity
-        companies = list(companies_map.values())
-        companies.sort(key=lambda x: x['last_filing'], reverse=True)
+        companies = []
+        for ticker, company_filings in filings_by_company.items():
+            first = company_filings[0]
+            dates = [filing.filing_date for filing in company_filings if filing.filing_date]
+            companies.append({
+                'ticker': ticker,
+                'company_name': first.company_name or 'Unknown Company',
+                'cik': first.cik,
+                'filing_count': len(company_filings),
+                'first_filing': min(dates) if dates else None,
+                'last_filing': max(dates) if dates else None,
+                'filings': company_filings
+            })
+        
+        # Sort by most recent activity
+        companies.sort(key=lambda x: x['last_filing'] or '', reverse=True)
         
         return companies
 
@@ -266,6 +356,12 @@ def generate_name_variations(person_name: str) -> List[str]:
     Examples:
         "John Smith" -> ["John Smith", "Smith John", "SMITH JOHN", "John Q Smith"]
     """
+    return list(_name_variations(person_name))
+
+
+@lru_cache(maxsize=4096)
+def _name_variations(person_name: str) -> Tuple[str, ...]:
+    """Memoized body of generate_name_variations; a tuple so cached results can't be mutated."""
     variations = []
     
     # Clean and normalize the name
@@ -273,7 +369,7 @@ def generate_name_variations(person_name: str) -> List[str]:
     parts = normalized.split()
     
     if not parts:
-        return [person_name]
+        return (person_name,)
     
     # Original name
     variations.append(person_name)
@@ -309,12 +405,7 @@ def generate_name_variations(person_name: str) -> List[str]:
         ])
     
     # Remove duplicates while preserving order
-    seen = set()
-    unique_variations = []
-    for v in variations:
-        v_clean = v.strip()
-        if v_clean and v_clean not in seen:
-            seen.add(v_clean)
-            unique_variations.append(v_clean)
+    unique_variations = dict.fromkeys(map(str.strip, variations))
+    unique_variations.pop('', None)
     
-    return unique_variations
\ No newline at end of file
+    return tuple(unique_variations)
\ No newline at end of file
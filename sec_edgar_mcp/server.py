@@ -1,13 +1,12 @@
 import argparse
+import asyncio
+import logging
 import requests
 import xml.etree.ElementTree as ET
 import re
-from typing import List, Union, Dict, Optional, Any
-from secedgar.core.rest import (
-    get_submissions,
-    get_company_concepts,
-    get_xbrl_frames,
-)
+from itertools import islice
+from typing import Callable, List, Union, Dict, Optional, Any
+from secedgar.cik_lookup import CIKLookup
 from mcp.server.fastmcp import FastMCP
 
 try:
@@ -25,10 +24,15 @@ from .unified_search import register_unified_tools
 from .cross_company_search import register_cross_company_tools
 from .comprehensive_reports import register_comprehensive_report_tools
 from .person_cik_resolver import integrate_cik_resolver
+from .utils import rate_limiter
+from .http_client import get_secedgar_client, get_session
 
 
 sec_edgar_user_agent = initialize_config()
 
+# One pooled session for every tool
+http_session = get_session()
+
 # Cache for ticker to CIK mapping
 _ticker_to_cik_cache: Optional[Dict[str, int]] = None
 
@@ -38,6 +42,10 @@ document_parser = SECDocumentParser(sec_edgar_user_agent)
 # Initialize MCP
 mcp = FastMCP("SEC EDGAR MCP", dependencies=["secedgar", "beautifulsoup4", "lxml"])
 
+# FASTMCP_LOG_LEVEL=DEBUG is for our own loggers; urllib3 would otherwise log every connection and request
+for _http_logger in ('urllib3', 'requests'):
+    logging.getLogger(_http_logger).setLevel(logging.WARNING)
+
 
 def _fetch_ticker_to_cik_mapping() -> Dict[str, int]:
     """
@@ -54,7 +62,7 @@ def _fetch_ticker_to_cik_mapping() -> Dict[str, int]:
     try:
         url = "https://www.sec.gov/files/company_tickers_exchange.json"
         headers = {"User-Agent": sec_edgar_user_agent}
-        response = requests.get(url, headers=headers)
+        response = http_session.get(url, headers=headers)
         response.raise_for_status()
 
         data = response.json()
@@ -122,8 +130,93 @@ def get_cik_by_ticker_tool(ticker: str) -> Dict[str, Union[int, str]]:
         return {"error": f"Failed to lookup CIK for ticker '{ticker}': {str(e)}", "ticker": ticker, "success": False}
 
 
+# Upper bound on SEC requests in flight for a single tool call
+_MAX_CONCURRENT_LOOKUPS = 10
+
+
+async def _fan_out_lookups(func: Callable[..., Dict[str, Any]], lookups: Union[str, List[str]], **kwargs) -> Dict[str, Any]:
+    """
+    Call a REST helper once per lookup in worker threads and merge the results.
+
+    The helpers fetch lookups one after another; running them concurrently
+    overlaps the round trips while the rate limiter in ``_get_json`` keeps SEC's pace.
+    """
+    if isinstance(lookups, str):
+        lookups = [lookups]
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_LOOKUPS)
+
+    async def fetch_one(lookup: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await asyncio.to_thread(func, lookups=[lookup], **kwargs)
+
+    merged: Dict[str, Any] = {}
+    for result in await asyncio.gather(*(fetch_one(lookup) for lookup in lookups)):
+        merged.update(result)
+    return merged
+
+
+# SEC's JSON APIs, called through the shared session rather than secedgar.core.rest
+SUBMISSIONS_BASE = "https://data.sec.gov/submissions/"
+XBRL_BASE = "https://data.sec.gov/api/xbrl/"
+
+
+def _get_json(url: str, user_agent: str) -> Any:
+    rate_limiter.wait_if_needed()
+    response = http_session.get(url, headers={"User-Agent": user_agent})
+    response.raise_for_status()
+    return response.json()
+
+
+def _lookup_ciks(lookups: Union[str, List[str]], user_agent: str) -> Dict[str, str]:
+    """Map each ticker, company name or CIK to its CIK."""
+    return CIKLookup(lookups, client=get_secedgar_client(user_agent)).lookup_dict
+
+
+def get_submissions(lookups: Union[str, List[str]], user_agent: str, recent: bool = True) -> Dict[str, Any]:
+    """
+    Get submission records per lookup from data.sec.gov.
+
+    With ``recent`` False, the older submission files are fetched as well and
+    their columns appended to ``filings.recent``.
+    """
+    submissions = {}
+    for lookup, cik in _lookup_ciks(lookups, user_agent).items():
+        data = _get_json(f"{SUBMISSIONS_BASE}CIK{cik.zfill(10)}.json", user_agent)
+        if not recent:
+            combined = data["filings"]["recent"]
+            for older_file in data["filings"].get("files", []):
+                older = _get_json(f"{SUBMISSIONS_BASE}{older_file['name']}", user_agent)
+                for column, values in older.items():
+                    combined[column] = combined.get(column, []) + values
+        submissions[lookup] = data
+    return submissions
+
+
+def get_company_concepts(lookups: Union[str, List[str]], user_agent: str, concept_name: str) -> Dict[str, Any]:
+    """Get one us-gaap concept's data per lookup from data.sec.gov."""
+    return {
+        lookup: _get_json(f"{XBRL_BASE}companyconcept/CIK{cik.zfill(10)}/us-gaap/{concept_name}.json", user_agent)
+        for lookup, cik in _lookup_ciks(lookups, user_agent).items()
+    }
+
+
+def get_xbrl_frames(
+    user_agent: str,
+    concept_name: str,
+    year: int,
+    quarter: Optional[int] = None,
+    currency: str = "USD",
+    instantaneous: bool = False,
+) -> Dict[str, Any]:
+    """Get a us-gaap concept across companies for one calendar year or quarter from data.sec.gov."""
+    period = f"CY{year}" if quarter is None else f"CY{year}Q{quarter}"
+    if instantaneous:
+        period += "I"
+    return _get_json(f"{XBRL_BASE}frames/us-gaap/{concept_name}/{currency}/{period}.json", user_agent)
+
+
 @mcp.tool("get_submissions")
-def get_submissions_tool(
+async def get_submissions_tool(
     lookups: Union[str, List[str]],
     user_agent: str = sec_edgar_user_agent,
     recent: bool = True,
@@ -140,7 +233,7 @@ def get_submissions_tool(
         Dict[str, dict]: A dictionary mapping each lookup to its submission data.
     """
     try:
-        return get_submissions(lookups=lookups, user_agent=user_agent, recent=recent)
+        return await _fan_out_lookups(get_submissions, lookups, user_agent=user_agent, recent=recent)
     except Exception as e:
         return {
             "error": f"Failed to get submissions: {str(e)}",
@@ -149,7 +242,7 @@ def get_submissions_tool(
 
 
 @mcp.tool("get_company_concepts")
-def get_company_concepts_tool(
+async def get_company_concepts_tool(
     lookups: Union[str, List[str]],
     concept_name: str,
     user_agent: str = sec_edgar_user_agent,
@@ -166,8 +259,9 @@ def get_company_concepts_tool(
         Dict[str, dict]: A dictionary mapping each lookup to its concept data.
     """
     try:
-        return get_company_concepts(
-            lookups=lookups,
+        return await _fan_out_lookups(
+            get_company_concepts,
+            lookups,
             concept_name=concept_name,
             user_agent=user_agent,
         )
@@ -467,7 +561,7 @@ def get_recent_filings_rss_tool(cik: str, filing_type: str = "*", count: int = 4
             "Accept-Language": "en-US,en;q=0.5",
         }
 
-        response = requests.get(rss_url, headers=headers, timeout=30)
+        response = http_session.get(rss_url, headers=headers, timeout=30)
         response.raise_for_status()
 
         # Parse XML/ATOM content
@@ -777,7 +871,7 @@ def get_company_facts_summary_tool(cik: str, user_agent: str = sec_edgar_user_ag
 
         headers = {"User-Agent": user_agent, "Accept": "application/json"}
 
-        response = requests.get(api_url, headers=headers, timeout=30)
+        response = http_session.get(api_url, headers=headers, timeout=30)
         response.raise_for_status()
 
         data = response.json()
@@ -800,7 +894,7 @@ def get_company_facts_summary_tool(cik: str, user_agent: str = sec_edgar_user_ag
             for category, concepts in facts.items():
                 category_summary[category] = {
                     "concept_count": len(concepts),
-                    "sample_concepts": list(concepts.keys())[:10],
+                    "sample_concepts": list(islice(concepts, 10)),
                 }
 
             summary["categories"] = category_summary
@@ -848,7 +942,7 @@ def get_company_facts_concepts_tool(
 
         headers = {"User-Agent": user_agent, "Accept": "application/json"}
 
-        response = requests.get(api_url, headers=headers, timeout=30)
+        response = http_session.get(api_url, headers=headers, timeout=30)
         response.raise_for_status()
 
         data = response.json()
@@ -938,7 +1032,7 @@ def list_company_facts_concepts_tool(
 
         headers = {"User-Agent": user_agent, "Accept": "application/json"}
 
-        response = requests.get(api_url, headers=headers, timeout=30)
+        response = http_session.get(api_url, headers=headers, timeout=30)
         response.raise_for_status()
 
         data = response.json()
@@ -1017,7 +1111,7 @@ def get_specific_concept_values_tool(
 
         headers = {"User-Agent": user_agent, "Accept": "application/json"}
 
-        response = requests.get(api_url, headers=headers, timeout=30)
+        response = http_session.get(api_url, headers=headers, timeout=30)
         response.raise_for_status()
 
         data = response.json()
@@ -1036,7 +1130,7 @@ def get_specific_concept_values_tool(
         if concept not in category_facts:
             return {
                 "error": f"Concept '{concept}' not found in {category}",
-                "available_concepts": list(category_facts.keys())[:20],
+                "available_concepts": list(islice(category_facts, 20)),
                 "suggestion": "Use list_company_facts_concepts to find the exact concept name",
                 "cik": formatted_cik,
                 "success": False,
@@ -1162,7 +1256,7 @@ def compare_concept_periods_tool(
 
         headers = {"User-Agent": user_agent, "Accept": "application/json"}
 
-        response = requests.get(api_url, headers=headers, timeout=30)
+        response = http_session.get(api_url, headers=headers, timeout=30)
         response.raise_for_status()
 
         data = response.json()
@@ -2668,7 +2762,7 @@ def get_recent_filings_smart_tool(
             try:
                 rss_url = f"https://data.sec.gov/rss?cik={normalized_cik}&type={form_type}&count={count}"
                 headers = {"User-Agent": user_agent}
-                response = requests.get(rss_url, headers=headers, timeout=30)
+                response = http_session.get(rss_url, headers=headers, timeout=30)
                 response.raise_for_status()
 
                 content_text = response.text
@@ -2814,7 +2908,7 @@ def get_recent_filings_smart_tool(
                 try:
                     rss_url = f"https://data.sec.gov/rss?cik={normalized_cik}&type={default_form}&count={count}"
                     headers = {"User-Agent": user_agent}
-                    response = requests.get(rss_url, headers=headers, timeout=30)
+                    response = http_session.get(rss_url, headers=headers, timeout=30)
                     response.raise_for_status()
 
                     # Parse ATOM XML
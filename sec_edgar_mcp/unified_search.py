@@ -1,6 +1,10 @@
 """Unified search interface for high-level SEC EDGAR queries."""
 
+import asyncio
+import functools
 import logging
+import math
+import re
 from typing import Dict, Any, List, Optional
 from datetime import date, timedelta
 from mcp.server.fastmcp import FastMCP
@@ -9,15 +13,25 @@ from .insider_tools import get_insider_transactions, get_recent_insider_activity
 from .institutional_tools import get_13f_holdings, search_institutional_ownership, get_major_shareholders
 from .financial_parser import get_product_revenue, analyze_revenue_trends
 from .models import OwnershipSummary
+from .utils import normalize_ticker
 
 logger = logging.getLogger(__name__)
 
+# Words that mark an entity as a company rather than a person. Anchored at the
+# start of a word only, so "Corporation" still counts but "Vince" no longer does.
+_CORP_RE = re.compile(r'\b(?:corp|inc|llc|fund|capital|partners)', re.IGNORECASE)
+_REPORT_CORP_RE = re.compile(r'\b(?:corp|inc|llc|fund|capital)', re.IGNORECASE)
+
+# Time periods like "1Y", "6Q" or "18M"; a bare number means years
+_PERIOD_RE = re.compile(r'(\d+)\s*([YQM]?)', re.IGNORECASE)
+_PERIODS_PER_YEAR = {'Y': 1, 'Q': 4, 'M': 12}
+
 
 def register_unified_tools(mcp: FastMCP, user_agent: str):
     """Register unified search tools with the MCP server."""
     
     @mcp.tool("answer_ownership_question")
-    def answer_ownership_question_tool(
+    async def answer_ownership_question_tool(
         entity_name: str,
         company: str,
         include_history: bool = False,
@@ -38,7 +52,7 @@ def register_unified_tools(mcp: FastMCP, user_agent: str):
         Example:
             answer_ownership_question("Warren Buffett", "AAPL", include_history=True)
         """
-        return answer_ownership_question(
+        return await answer_ownership_question(
             entity_name=entity_name,
             company=company,
             include_history=include_history,
@@ -104,13 +118,18 @@ def register_unified_tools(mcp: FastMCP, user_agent: str):
         )
 
 
-def answer_ownership_question(
+async def answer_ownership_question(
     entity_name: str,
     company: str,
     include_history: bool = False,
     user_agent: str = None
 ) -> Dict[str, Any]:
-    """Combine all ownership data sources to answer ownership questions."""
+    """
+    Combine all ownership data sources to answer ownership questions.
+    
+    The insider or institutional lookup and the 13D/13G lookup are independent,
+    so they run concurrently in worker threads.
+    """
     
     ownership_data = {
         "entity_name": entity_name,
@@ -130,14 +149,35 @@ def answer_ownership_question(
         "data_sources": []
     }
     
+    # Lookups are @cached on their arguments; "aapl" and "AAPL " should share entries
+    company_key = normalize_ticker(company)
+    
     # Check if entity is an individual (potential insider)
-    if not any(corp_word in entity_name.lower() for corp_word in ['corp', 'inc', 'llc', 'fund', 'capital', 'partners']):
+    is_individual = not _CORP_RE.search(entity_name)
+    if is_individual:
         # Search for insider holdings
-        insider_data = get_recent_insider_activity(
-            company=company,
+        entity_lookup = asyncio.to_thread(
+            get_recent_insider_activity,
+            company=company_key,
             days_back=365 if include_history else 90,
             user_agent=user_agent
         )
+    else:
+        # Search for institutional holdings
+        entity_lookup = asyncio.to_thread(
+            get_13f_holdings,
+            institution=entity_name,
+            user_agent=user_agent
+        )
+    
+    # Check for major shareholder filings (13D/13G) alongside
+    entity_data, major_holder_data = await asyncio.gather(
+        entity_lookup,
+        asyncio.to_thread(get_major_shareholders, company=company_key, user_agent=user_agent)
+    )
+    
+    if is_individual:
+        insider_data = entity_data
         
         # Look for the specific person in insider data
         for insider_name, data in insider_data.get("insiders", {}).items():
@@ -150,21 +190,9 @@ def answer_ownership_question(
     
     # Check for institutional holdings
     else:
-        # Search for institutional holdings
-        inst_data = get_13f_holdings(
-            institution=entity_name,
-            user_agent=user_agent
-        )
-        
-        ownership_data["ownership_breakdown"]["institutional_holdings"] = inst_data
+        ownership_data["ownership_breakdown"]["institutional_holdings"] = entity_data
         ownership_data["data_sources"].append("13F filings")
     
-    # Check for major shareholder filings (13D/13G)
-    major_holder_data = get_major_shareholders(
-        company=company,
-        user_agent=user_agent
-    )
-    
     # Calculate totals
     total_shares = 0
     if ownership_data["ownership_breakdown"]["insider_holdings"]:
@@ -175,6 +203,16 @@ def answer_ownership_question(
     return ownership_data
 
 
+@functools.lru_cache(maxsize=64)
+def _period_years(time_period: str) -> int:
+    """Whole years covered by a time period string, rounding partial years up."""
+    match = _PERIOD_RE.fullmatch(time_period.strip())
+    if not match:
+        return 1
+    count, unit = int(match[1]), (match[2] or 'Y').upper()
+    return max(1, math.ceil(count / _PERIODS_PER_YEAR[unit]))
+
+
 def answer_sales_question(
     company: str,
     product_or_segment: str,
@@ -184,13 +222,16 @@ def answer_sales_question(
     """Analyze product/segment sales data."""
     
     # Parse time period
-    years = int(time_period[0]) if time_period[0].isdigit() else 1
+    years = _period_years(time_period)
     end_year = date.today().year
     start_year = end_year - years
     
+    # Lookups are @cached on their arguments; "aapl" and "AAPL " should share entries
+    company_key = normalize_ticker(company)
+    
     # Get product revenue data
     revenue_data = get_product_revenue(
-        company=company,
+        company=company_key,
         product_name=product_or_segment,
         start_year=start_year,
         end_year=end_year,
@@ -199,7 +240,7 @@ def answer_sales_question(
     
     # Analyze trends
     trend_analysis = analyze_revenue_trends(
-        company=company,
+        company=company_key,
         segment=product_or_segment,
         years_back=years,
         user_agent=user_agent
@@ -223,15 +264,17 @@ def generate_entity_report(
 ) -> Dict[str, Any]:
     """Generate comprehensive activity report for multiple entities."""
     
+    today = date.today()
+    report_period = {
+        "start": (today - timedelta(days=days_back)).isoformat(),
+        "end": today.isoformat()
+    }
     reports = {}
     
     for entity in entity_names:
         entity_report = {
             "entity_name": entity,
-            "report_period": {
-                "start": (date.today() - timedelta(days=days_back)).isoformat(),
-                "end": date.today().isoformat()
-            },
+            "report_period": dict(report_period),
             "activities": {}
         }
         
@@ -246,7 +289,7 @@ def generate_entity_report(
         
         # Check for institutional activity
         if "all" in activity_types or "institutional" in activity_types:
-            if any(corp_word in entity.lower() for corp_word in ['corp', 'inc', 'llc', 'fund', 'capital']):
+            if _REPORT_CORP_RE.search(entity):
                 entity_report["activities"]["institutional"] = {
                     "holdings": [],
                     "recent_changes": []
@@ -259,4 +302,4 @@ def generate_entity_report(
         "report_period_days": days_back,
         "activity_types": activity_types,
         "entity_reports": reports
-    }
\ No newline at end of file
+    }